@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: bench_bftools.py
+Date: 18.10.2026
+Version. 0.1
+
+Benchmark for the read and metadata functions of bftools using synthetic OME-TIFF files.
+The results are saved as JSON, so they can be compared between commits and between
+versions of bioformats_package.jar.
+
+Usage:
+------
+
+python bench_bftools.py -s 1 2 10 2 1024 1024 -p uint16 -r 3 -o bench_5.9.2.json
+python bench_bftools.py -b bfpackage/6.0.0/bioformats_package.jar -o bench_6.0.0.json
+"""
+
+from __future__ import print_function
+import bftools as bf
+import numpy as np
+import argparse
+import platform
+import subprocess
+import tempfile
+import json
+import copy
+import time
+import sys
+import os
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+def get_peak_rss():
+    """
+    Return the peak resident set size of this process in MB or None if it cannot be determined.
+    """
+
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kB, macOS reports bytes
+        if sys.platform == 'darwin':
+            return maxrss / 1024.0 ** 2
+        return maxrss / 1024.0
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1024.0 ** 2
+    except (ImportError, AttributeError):
+        return None
+
+
+def get_commit():
+    # the current git commit of the repository, if available
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_testdata(filename, sizes, pixeltype='uint16', seed=42):
+    """
+    Write a synthetic OME-TIFF with the dimension sizes [S, T, Z, C, Y, X] using write_ometiff.
+    """
+
+    rng = np.random.RandomState(seed)
+    info = np.iinfo(pixeltype) if np.issubdtype(np.dtype(pixeltype), np.integer) else None
+
+    if info is not None:
+        img6d = rng.randint(info.min, min(info.max, 2 ** 16 - 1) + 1, size=sizes).astype(pixeltype)
+    else:
+        img6d = rng.random_sample(sizes).astype(pixeltype)
+
+    bf.write_ometiff(filename, img6d, pixeltype=pixeltype, swapxyaxes=True)
+
+    return filename
+
+
+def get_read_size(result):
+    """
+    Return the number of planes and bytes of the array returned by a read function.
+    Functions returning a tuple, like get_image6d, have the array as first item.
+    """
+
+    if isinstance(result, tuple):
+        result = result[0]
+    if not isinstance(result, np.ndarray):
+        return 0, 0
+
+    return int(np.prod(result.shape[:-2])), int(result.nbytes)
+
+
+def run_benchmark(name, func, repeat):
+    """
+    Call func repeat times and return the timing results. The first call is reported
+    separately, because it includes the initialization of the reader. The number of
+    planes and bytes is taken from the array returned by func.
+    """
+
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        times.append(time.perf_counter() - start)
+
+    # planes which could not be read stay empty and must not count as throughput
+    if isinstance(output, tuple) and 'NOK' in output[1:]:
+        raise RuntimeError(name + ' could not read all planes.')
+
+    planes, nbytes = get_read_size(output)
+
+    best = min(times)
+    result = {'name': name,
+              'planes': planes,
+              'bytes': nbytes,
+              'times': times,
+              'first': times[0],
+              'best': best,
+              'mean': float(np.mean(times)),
+              'planes_per_s': planes / best if best > 0 else None,
+              'MB_per_s': nbytes / 1024.0 ** 2 / best if best > 0 else None,
+              'peak_rss_MB': get_peak_rss()}
+
+    print('{:<32} {:>10.4f} s {:>12.1f} planes/s {:>10.1f} MB/s'.format(name, best,
+                                                                      result['planes_per_s'] or 0,
+                                                                      result['MB_per_s'] or 0))
+
+    return result
+
+
+def run_suite(filename, sizes, pixeltype, repeat=3):
+    """
+    Run all benchmarks for the test file and return the list of results.
+    """
+
+    S, T, Z, C, Y, X = sizes
+    results = []
+
+    # metadata - without the cache to measure the real work
+    results.append(run_benchmark('get_relevant_metainfo_wrapper',
+                                 lambda: bf.get_relevant_metainfo_wrapper(filename, usecache=False),
+                                 repeat))
+
+    MetaInfo = bf.get_relevant_metainfo_wrapper(filename, usecache=False)
+
+    # the throughput is only meaningful, if the complete test data is found
+    if list(MetaInfo['Sizes']) != list(sizes):
+        raise ValueError('The sizes read from ' + filename + ' ' + str(MetaInfo['Sizes']) +
+                         ' do not match the test data ' + str(list(sizes)) + '.')
+
+    results.append(run_benchmark('get_planetable',
+                                 lambda: bf.get_planetable(filename, showinfo=False, usecache=False),
+                                 repeat))
+
+    # pixel data
+    results.append(run_benchmark('get_image2d',
+                                 lambda: bf.get_image2d(filename, 0, 0, 0, 0),
+                                 repeat))
+
+    results.append(run_benchmark('get_zstack',
+                                 lambda: bf.get_zstack(filename, list(MetaInfo['Sizes']), 0),
+                                 repeat))
+
+    # get_image6d changes the sizes inside MetaInfo, so it always gets a copy
+    numscenes = MetaInfo['Sizes'][0]
+    results.append(run_benchmark('get_image6d',
+                                 lambda: bf.get_image6d(filename, copy.deepcopy(MetaInfo), num_scenes=numscenes),
+                                 repeat))
+
+    # first half of the z-stack for all channels and time points of the first series
+    zend = max(1, Z // 2)
+    results.append(run_benchmark('get_image6d_subset',
+                                 lambda: bf.get_image6d_subset(filename, list(MetaInfo['Sizes']),
+                                                               seriesstart=0, seriesend=1,
+                                                               tstart=0, tend=T,
+                                                               zstart=0, zend=zend,
+                                                               chstart=0, chend=C),
+                                 repeat))
+
+    return results
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark bftools using synthetic OME-TIFF files.')
+    parser.add_argument('-s', '--sizes', type=int, nargs=6, default=[1, 2, 10, 2, 512, 512],
+                        metavar=('S', 'T', 'Z', 'C', 'Y', 'X'), help='dimension sizes of the test data')
+    parser.add_argument('-p', '--pixeltype', default='uint16', help='pixel type, e.g. uint8, uint16, float32')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='number of runs per benchmark')
+    parser.add_argument('-b', '--bfpath', default=bf.BFPATH, help='path to bioformats_package.jar')
+    parser.add_argument('-e', '--backend', default='bioformats', help='pixel backend, see bftools.select_backend')
+    parser.add_argument('-d', '--workdir', default=None, help='directory for the test data, default is a temporary one')
+    parser.add_argument('-o', '--output', default='bench_bftools.json', help='JSON file for the results')
+    args = parser.parse_args()
+
+    bf.set_bfpath(args.bfpath)
+    bf.set_backend(args.backend)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bftools_bench_')
+    filename = os.path.join(workdir, 'bench_' + '_'.join(str(s) for s in args.sizes) + '_' + args.pixeltype + '.ome.tiff')
+
+    print('Creating test data : ', filename)
+    create_testdata(filename, args.sizes, pixeltype=args.pixeltype)
+
+    results = run_suite(filename, args.sizes, args.pixeltype, repeat=args.repeat)
+
+    report = {'commit': get_commit(),
+              'bfpath': args.bfpath,
+              'backend': args.backend,
+              'sizes': args.sizes,
+              'pixeltype': args.pixeltype,
+              'repeat': args.repeat,
+              'python': platform.python_version(),
+              'numpy': np.__version__,
+              'platform': platform.platform(),
+              'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+              'results': results}
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print('Results written to : ', args.output)
+
+    bf.kill_jvm()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: bfasync.py
+Date: 18.10.2026
+Version. 0.1
+
+asyncio counterparts of the bftools read functions. All calls into BioFormats run on
+a dedicated executor, whose threads are attached to the JVM and own their readers,
+so the event loop is never blocked.
+
+Usage:
+------
+
+import bfasync
+
+img2d = await bfasync.get_image2d_async(filename, 0, 0, 0, 0)
+MetaInfo = await bfasync.get_relevant_metainfo_wrapper_async(filename)
+"""
+
+import bftools as bf
+import javabridge as jv
+import asyncio
+import atexit
+import queue
+import threading
+import weakref
+from concurrent.futures import Executor, Future
+
+
+# number of threads reading from BioFormats and maximum number of requests running at once
+MAXWORKERS = 4
+MAXREQUESTS = 16
+
+
+class JVMExecutor(Executor):
+    """
+    Executor running the submitted calls on threads attached to the JVM.
+
+    Every thread stays attached for its whole lifetime and uses its own ReaderPool,
+    so a reader is reused by the following calls of the same thread but never shared
+    between threads. The readers are closed and the threads detached on shutdown.
+    """
+
+    def __init__(self, max_workers=MAXWORKERS):
+        self.max_workers = max_workers
+        self._calls = queue.Queue()
+        self._threads = []
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('Cannot submit new calls after the executor was shut down.')
+
+            # the JVM must be running before the threads can attach to it
+            bf.JVM.start()
+
+            future = Future()
+            self._calls.put((future, fn, args, kwargs))
+
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker, name='bftools-jvm-' + str(len(self._threads)))
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+        return future
+
+    def _worker(self):
+
+        jv.attach()
+        pool = bf.ReaderPool(maxreaders=bf.POOLSIZE)
+        bf.set_thread_readerpool(pool)
+
+        try:
+            while True:
+                call = self._calls.get()
+                if call is None:
+                    break
+
+                future, fn, args, kwargs = call
+                # skip calls which were cancelled while waiting
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as error:
+                    future.set_exception(error)
+        finally:
+            pool.close()
+            bf.set_thread_readerpool(None)
+            jv.detach()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._shutdown = True
+            for thread in self._threads:
+                self._calls.put(None)
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+EXECUTOR = None
+_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def set_async_limits(max_workers=MAXWORKERS, max_requests=MAXREQUESTS):
+    # this function can be used to change the number of JVM threads and the number of concurrent requests
+    global MAXWORKERS, MAXREQUESTS, EXECUTOR
+
+    MAXWORKERS = max_workers
+    MAXREQUESTS = max_requests
+
+    # the next call creates a new executor with the new number of threads
+    if EXECUTOR is not None:
+        EXECUTOR.shutdown(wait=False)
+        EXECUTOR = None
+    _SEMAPHORES.clear()
+
+    return MAXWORKERS, MAXREQUESTS
+
+
+def get_executor():
+    """
+    Return the JVMExecutor shared by all async functions.
+    """
+    global EXECUTOR
+
+    if EXECUTOR is None:
+        EXECUTOR = JVMExecutor(max_workers=MAXWORKERS)
+
+    return EXECUTOR
+
+
+def _shutdown_executor():
+    # runs before bftools kills the JVM, because atexit calls the handlers in reverse order
+    if EXECUTOR is not None:
+        EXECUTOR.shutdown(wait=True)
+
+
+atexit.register(_shutdown_executor)
+
+
+def _limit():
+    # one semaphore per event loop limits the number of requests waiting for the executor
+    loop = asyncio.get_running_loop()
+    if loop not in _SEMAPHORES:
+        _SEMAPHORES[loop] = asyncio.Semaphore(MAXREQUESTS)
+
+    return _SEMAPHORES[loop]
+
+
+async def run_in_jvm(fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) on the JVM executor and wait for the result without blocking the loop.
+    Cancelling the awaiting task cancels the call as long as it was not started yet.
+    """
+
+    return await asyncio.wrap_future(get_executor().submit(fn, *args, **kwargs))
+
+
+async def get_image2d_async(imagefile, seriesID, channel, zplane, timepoint, xywh=None, backend=None):
+    """
+    Async version of bftools.get_image2d.
+    """
+
+    async with _limit():
+        return await run_in_jvm(bf.get_image2d, imagefile, seriesID, channel, zplane, timepoint,
+                                xywh=xywh, backend=backend)
+
+
+async def get_zstack_async(imagefile, sizes, seriesID, timepoints='full', tindex=0, xywh=None, backend=None):
+    """
+    Async version of bftools.get_zstack. The whole stack is read by a single call on the executor,
+    which uses one reader for all planes.
+    """
+
+    async with _limit():
+        return await run_in_jvm(bf.get_zstack, imagefile, sizes, seriesID, timepoints=timepoints,
+                                tindex=tindex, xywh=xywh, backend=backend)
+
+
+async def get_planetable_async(imagefile, writecsv=False, separator='\t', imageID=0, showinfo=True, usecache=None):
+    """
+    Async version of bftools.get_planetable.
+    """
+
+    async with _limit():
+        return await run_in_jvm(bf.get_planetable, imagefile, writecsv=writecsv, separator=separator,
+                                imageID=imageID, showinfo=showinfo, usecache=usecache)
+
+
+async def get_relevant_metainfo_wrapper_async(imagefile, **kwargs):
+    """
+    Async version of bftools.get_relevant_metainfo_wrapper. The keyword arguments are passed on.
+    """
+
+    async with _limit():
+        return await run_in_jvm(bf.get_relevant_metainfo_wrapper, imagefile, **kwargs)
@@ -11,18 +11,26 @@ import javabridge as jv
 import bioformats
 
 import numpy as np
-import czitools as czt
 import os
-import pandas as pd
-from lxml import etree as etl
 import sys
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
 import subprocess
-import tifffile
-from mpl_toolkits.mplot3d import axes3d
-from matplotlib import cm
-import matplotlib.pyplot as plt
+import atexit
+import pickle
+import hashlib
+import glob
+import tempfile
+import threading
+import queue
+import time
+import json
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+# pandas, lxml, tifffile, matplotlib and czitools are imported inside the functions using them,
+# so importing bftools stays fast for batch workers and command line tools not using them
 
 
 VM_STARTED = False
@@ -31,6 +39,25 @@ VM_KILLED = False
 # define default path to bioformats_package.jar globally
 BFPATH = r'bfpackage/5.9.2/bioformats_package.jar'
 
+# maximum number of initialized ImageReaders kept open by the reader pool
+POOLSIZE = 4
+
+# default backend for reading pixel data - see select_backend
+BACKEND = 'auto'
+TIFF_EXTENSIONS = ('.tif', '.tiff', '.btf', '.tf2', '.tf8')
+
+# memory budget in bytes for full-stack reads - larger stacks are written into a memory-mapped file.
+# None disables the automatic switch. MEMMAPDIR is the directory for those temporary files.
+MEMBUDGET = None
+MEMMAPDIR = None
+
+# directory and maximum size in bytes of the on-disk metadata cache
+CACHEDIR = os.path.join(os.path.expanduser('~'), '.bftools_cache')
+CACHESIZE = 512 * 1024 ** 2
+# the cache entries are pickle files, which can run code when loaded - so the cache is only
+# used when enabled with set_usecache or the environment variable BFTOOLS_CACHE=1
+USECACHE = os.environ.get('BFTOOLS_CACHE', '0').lower() in ('1', 'true', 'yes')
+
 BF2NP_DTYPE = {
     0: np.int8,
     1: np.uint8,
@@ -51,12 +78,61 @@ def set_bfpath(bfpackage_path=BFPATH):
     return BFPATH
 
 
+def set_poolsize(maxreaders=POOLSIZE):
+    # this function can be used to change the number of readers kept open by the reader pool
+    global POOLSIZE
+    POOLSIZE = maxreaders
+    READERPOOL.resize(maxreaders)
+
+    return POOLSIZE
+
+
+def set_cachedir(cachedir=CACHEDIR, maxsize=CACHESIZE):
+    # this function can be used to set the location and maximum size of the metadata cache
+    global CACHEDIR, CACHESIZE
+    CACHEDIR = cachedir
+    CACHESIZE = maxsize
+    METACACHE.cachedir = cachedir
+    METACACHE.maxsize = maxsize
+    METACACHE.evict()
+
+    return CACHEDIR
+
+
+def set_usecache(usecache=False):
+    # this function can be used to enable the metadata cache for all calls without usecache argument
+    global USECACHE
+    USECACHE = usecache
+
+    return USECACHE
+
+
+def set_backend(backend='auto'):
+    # this function can be used to set the default backend for reading pixel data
+    global BACKEND
+    BACKEND = backend
+
+    return BACKEND
+
+
+def set_membudget(membudget=None, memmapdir=None):
+    # this function can be used to set the memory budget for full-stack reads in bytes
+    global MEMBUDGET, MEMMAPDIR
+    MEMBUDGET = membudget
+    MEMMAPDIR = memmapdir
+
+    return MEMBUDGET
+
+
 def start_jvm(max_heap_size='4G'):
     """
     Start the Java Virtual Machine, enabling BioFormats IO.
     Optional: Specify the path to the bioformats_package.jar to your needs by calling.
     set_bfpath before staring to read the image data
 
+    The JVM is managed by the module-level JVMSession JVM, so calling this function
+    more than once is harmless.
+
     Parameters
     ----------
     max_heap_size : string, optional
@@ -64,11 +140,7 @@ def start_jvm(max_heap_size='4G'):
     include '256M', '64k', and '2G'. Expect to need a lot.
     """
 
-    # TODO - include check for the OS, so that the file paths are always working
-
-    jars = jv.JARS + [BFPATH]
-    jv.start_vm(class_path=jars, max_heap_size=max_heap_size)
-    VM_STARTED = True
+    JVM.start(max_heap_size=max_heap_size)
 
 
 def kill_jvm():
@@ -76,8 +148,8 @@ def kill_jvm():
     Kill the JVM. Once killed, it cannot be restarted.
     See the python-javabridge documentation for more information.
     """
-    jv.kill_vm()
-    VM_KILLED = True
+
+    JVM.kill()
 
 
 def jvm_error():
@@ -89,12 +161,1080 @@ def jvm_error():
                        "and try again.")
 
 
+class ReadStats(object):
+    """
+    Opt-in instrumentation of the hot paths. Counts and times reader initialization, setSeries,
+    the JNI calls returning the plane bytes, the NumPy copies, the metadata getters and the
+    OME-XML parsing, and records the number of bytes for every step.
+
+    Usage:
+    ------
+
+    stats = bf.enable_stats(trace=True)
+    img6d, readstate = bf.get_image6d(filename, MetaInfo)
+    print(stats)
+    stats.write_trace('bftools_trace.json')   # open in chrome://tracing or ui.perfetto.dev
+    bf.disable_stats()
+    """
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.reset()
+
+    def reset(self):
+        """
+        Remove all recorded calls and trace events.
+        """
+        with self._lock:
+            self.counts = Counter()
+            self.times = Counter()
+            self.maxtimes = Counter()
+            self.nbytes = Counter()
+            self.events = []
+
+    def add(self, name, start, duration, nbytes=0):
+        """
+        Record a call of name, which started at start (time.perf_counter) and took duration seconds.
+        """
+        with self._lock:
+            self.counts[name] += 1
+            self.times[name] += duration
+            self.maxtimes[name] = max(self.maxtimes[name], duration)
+            self.nbytes[name] += nbytes
+
+            if self.trace:
+                # complete event of the Chrome trace format with times in microseconds
+                self.events.append({'name': name,
+                                    'cat': name.split('.')[0],
+                                    'ph': 'X',
+                                    'ts': (start - self._origin) * 1e6,
+                                    'dur': duration * 1e6,
+                                    'pid': os.getpid(),
+                                    'tid': threading.get_ident(),
+                                    'args': {'bytes': nbytes}})
+
+    def timer(self, name, nbytes=0):
+        """
+        Return a context manager recording the time of the with-block. The number of bytes
+        can be set inside the block using the nbytes attribute of the returned object.
+        """
+        return _StatsTimer(self, name, nbytes)
+
+    def summary(self):
+        """
+        Return a dictionary with count, total, mean and max time in seconds and the bytes for every recorded name.
+        """
+        with self._lock:
+            return OrderedDict((name, {'count': self.counts[name],
+                                       'total': self.times[name],
+                                       'mean': self.times[name] / self.counts[name],
+                                       'max': self.maxtimes[name],
+                                       'bytes': self.nbytes[name]})
+                               for name in sorted(self.counts))
+
+    def write_trace(self, filename):
+        """
+        Write the recorded events as Chrome trace JSON. Requires trace=True.
+        """
+        with self._lock:
+            events = list(self.events)
+
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+        return filename
+
+    def __str__(self):
+        lines = ['{:<28} {:>8} {:>12} {:>12} {:>14}'.format('Name', 'Count', 'Total [s]', 'Mean [ms]', 'MB')]
+        for name, entry in self.summary().items():
+            lines.append('{:<28} {:>8} {:>12.4f} {:>12.4f} {:>14.2f}'.format(name, entry['count'], entry['total'],
+                                                                          entry['mean'] * 1e3, entry['bytes'] / 1024.0 ** 2))
+
+        return '\n'.join(lines)
+
+
+class _StatsTimer(object):
+
+    def __init__(self, stats, name, nbytes=0):
+        self.stats = stats
+        self.name = name
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.add(self.name, self.start, time.perf_counter() - self.start, self.nbytes)
+        return False
+
+
+class _NoStats(object):
+    # used instead of a timer while the instrumentation is disabled
+
+    nbytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NOSTATS = _NoStats()
+
+# the active ReadStats object - None disables the instrumentation
+STATS = None
+
+
+def enable_stats(trace=False):
+    """
+    Enable the instrumentation and return the new ReadStats object. With trace=True every
+    single call is recorded as well, so it can be written as Chrome trace JSON.
+    """
+    global STATS
+    STATS = ReadStats(trace=trace)
+
+    return STATS
+
+
+def disable_stats():
+    """
+    Disable the instrumentation and return the last ReadStats object.
+    """
+    global STATS
+    stats = STATS
+    STATS = None
+
+    return stats
+
+
+def get_stats():
+    # the active ReadStats object or None
+    return STATS
+
+
+def _timed(name, nbytes=0):
+    # timer for the hot paths, which costs only a global lookup while the instrumentation is disabled
+    if STATS is None:
+        return _NOSTATS
+
+    return STATS.timer(name, nbytes)
+
+
+class TimedMetadata(object):
+    """
+    Wrapper around the Java metadata store, which times every getter call.
+    Used by get_java_metadata_store while the instrumentation is enabled.
+    """
+
+    def __init__(self, jmd):
+        self._jmd = jmd
+
+    def __getattr__(self, name):
+        method = getattr(self._jmd, name)
+        if not callable(method):
+            return method
+
+        def timed(*args):
+            with _timed('metadata.' + name):
+                return method(*args)
+
+        return timed
+
+
+class JVMSession(object):
+    """
+    Keeps track of the state of the Java Virtual Machine used by BioFormats.
+
+    The JVM is started once on first use and stays alive for any number of reads.
+    Since javabridge cannot restart a killed JVM, it is only killed explicitly
+    or when the Python interpreter exits.
+
+    Usage:
+    ------
+
+    with bf.JVM:
+        img6d, readstate = bf.get_image6d(filename, MetaInfo)
+        img2d = bf.get_image2d(filename, 0, 0, 0, 0)
+
+    Leaving the with-block closes the pooled readers. The JVM is only killed when
+    the session was created with killonexit=True.
+    """
+
+    def __init__(self, max_heap_size='4G', killonexit=False):
+        self.max_heap_size = max_heap_size
+        self.killonexit = killonexit
+        self.started = False
+        self.killed = False
+        self._depth = 0
+
+    def start(self, max_heap_size=None):
+        """
+        Start the JVM if it is not running yet. Raises a RuntimeError if the JVM was killed already.
+        """
+        global VM_STARTED
+
+        if self.killed:
+            jvm_error()
+
+        if not self.started:
+            if max_heap_size is None:
+                max_heap_size = self.max_heap_size
+
+            # TODO - include check for the OS, so that the file paths are always working
+            jars = jv.JARS + [BFPATH]
+            jv.start_vm(class_path=jars, max_heap_size=max_heap_size)
+            self.started = True
+            VM_STARTED = True
+
+        return self
+
+    def kill(self):
+        """
+        Close all pooled readers and kill the JVM. Once killed, it cannot be restarted.
+        """
+        global VM_KILLED
+
+        if self.started and not self.killed:
+            close_readers()
+            jv.kill_vm()
+            self.killed = True
+            VM_KILLED = True
+
+    @property
+    def alive(self):
+        return self.started and not self.killed
+
+    def __enter__(self):
+        self.start()
+        self._depth += 1
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth == 0:
+            if self.killonexit:
+                self.kill()
+            elif self.alive:
+                close_readers()
+
+        return False
+
+
+# the JVM session shared by all functions of this module
+JVM = JVMSession()
+
+# javabridge requires the JVM to be killed before the interpreter can exit
+atexit.register(JVM.kill)
+
+
+class ReaderPool(object):
+    """
+    Process-wide pool of initialized bioformats.ImageReader objects.
+
+    Initializing a reader parses the complete file header, which takes seconds for
+    large CZI files. The pool keeps the readers open and hands them out again for
+    the same file. Readers are keyed by the absolute path and the modification time
+    of the file, so a file that changed on disk is initialized again. If more than
+    maxreaders idle readers are open, the least recently used one is closed.
+
+    A reader is checked out exclusively by get until it is given back using release.
+    A second caller asking for the same file meanwhile, e.g. another thread, gets a
+    new reader, so setSeries of one caller never changes the planes read by another.
+    """
+
+    def __init__(self, maxreaders=POOLSIZE):
+        self.maxreaders = maxreaders
+        # idle readers for every key, the least recently used key first
+        self._readers = OrderedDict()
+        # readers checked out by get - id(reader) -> (key, reader)
+        self._busy = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(imagefile):
+        path = os.path.abspath(imagefile)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+
+        return path, mtime
+
+    def get(self, imagefile):
+        """
+        Check out an initialized reader for imagefile. An idle reader is reused,
+        otherwise a new one is opened. The reader must be given back using release.
+        """
+        key = self._key(imagefile)
+
+        with self._lock:
+            # readers for an older version of the same file are not valid anymore
+            for oldkey in [k for k in self._readers if k[0] == key[0] and k != key]:
+                for oldrdr in self._readers.pop(oldkey):
+                    oldrdr.close()
+
+            idle = self._readers.get(key)
+            if idle:
+                rdr = idle.pop()
+                if not idle:
+                    del self._readers[key]
+                self._busy[id(rdr)] = (key, rdr)
+                return rdr
+
+        # opening a reader takes long - other threads can use the pool meanwhile
+        rdr = open_reader(imagefile)
+
+        with self._lock:
+            self._busy[id(rdr)] = (key, rdr)
+
+        return rdr
+
+    def release(self, rdr):
+        """
+        Give a reader checked out by get back to the pool. Returns False if the reader
+        does not belong to the pool (anymore), so the caller has to close it.
+        """
+        with self._lock:
+            entry = self._busy.pop(id(rdr), None)
+            if entry is None:
+                return False
+
+            key = entry[0]
+            self._readers.setdefault(key, []).append(rdr)
+            self._readers.move_to_end(key)
+            self._evict()
+
+        return True
+
+    def _evict(self):
+        # close the least recently used idle readers when the pool is full
+        while sum(len(idle) for idle in self._readers.values()) > self.maxreaders:
+            lrukey = next(iter(self._readers))
+            idle = self._readers[lrukey]
+            idle.pop(0).close()
+            if not idle:
+                del self._readers[lrukey]
+
+    def close(self, imagefile=None):
+        """
+        Close the idle readers for imagefile or all idle readers if imagefile is None.
+        Readers checked out at the moment are closed when they are released.
+        """
+        with self._lock:
+            if imagefile is None:
+                path = None
+            else:
+                path = os.path.abspath(imagefile)
+
+            for key in [k for k in self._readers if path is None or k[0] == path]:
+                for rdr in self._readers.pop(key):
+                    rdr.close()
+
+            for rdrid in [i for i, (k, r) in self._busy.items() if path is None or k[0] == path]:
+                del self._busy[rdrid]
+
+    def resize(self, maxreaders):
+        """
+        Change the maximum number of idle readers and evict readers if required.
+        """
+        with self._lock:
+            self.maxreaders = maxreaders
+            self._evict()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(idle) for idle in self._readers.values()) + len(self._busy)
+
+    def __contains__(self, imagefile):
+        key = self._key(imagefile)
+        with self._lock:
+            return key in self._readers or any(k == key for k, r in self._busy.values())
+
+
+# the reader pool used by all functions reading pixel data
+READERPOOL = ReaderPool(maxreaders=POOLSIZE)
+
+# threads with their own reader pool - see set_thread_readerpool
+_THREADLOCAL = threading.local()
+
+
+def set_thread_readerpool(pool=None):
+    """
+    Give the current thread its own ReaderPool, which is then used by get_reader instead of
+    READERPOOL. So threads never share a pooled reader. None switches back to READERPOOL.
+    The caller is responsible to close the pool before the thread detaches from the JVM.
+    """
+
+    _THREADLOCAL.pool = pool
+
+
+def open_reader(imagefile):
+    """
+    Create and initialize a new bioformats.ImageReader. The original metadata are populated
+    as well, so the complete OME-XML can be taken from the reader using get_OMEXML_from_reader.
+    """
+
+    with _timed('reader.init'):
+        rdr = bioformats.ImageReader(imagefile, perform_init=False)
+        jv.run_script('reader.setOriginalMetadataPopulated(true);', dict(reader=rdr.rdr))
+        rdr.init_reader()
+
+    return rdr
+
+
+def get_reader(imagefile, usepool=True):
+    """
+    Return an initialized bioformats.ImageReader for imagefile.
+    With usepool=True the reader is taken from the process-wide READERPOOL, or the
+    pool of the current thread if set, and must be returned using release_reader
+    instead of being closed. Until then no other caller gets the same reader.
+    """
+
+    if usepool:
+        pool = getattr(_THREADLOCAL, 'pool', None)
+        if pool is None:
+            pool = READERPOOL
+        rdr = pool.get(imagefile)
+    else:
+        rdr = open_reader(imagefile)
+
+    return rdr
+
+
+def release_reader(rdr, usepool=True):
+    """
+    Counterpart of get_reader. Pooled readers are given back to their pool and stay
+    open for the next call, all other readers are closed.
+    """
+
+    if usepool:
+        for pool in (getattr(_THREADLOCAL, 'pool', None), READERPOOL):
+            if pool is not None and pool.release(rdr):
+                return
+
+    rdr.close()
+
+
+def close_readers(imagefile=None):
+    """
+    Close the pooled readers for a specific file or all pooled readers.
+    This must be called before the JVM is killed.
+    """
+
+    READERPOOL.close(imagefile)
+
+
+class MetaDataCache(object):
+    """
+    On-disk cache for the output of get_relevant_metainfo_wrapper and get_planetable.
+
+    Every entry is a pickle file inside cachedir, which is only accessible by the current user.
+    Loading a pickle can run code, so never point cachedir to a directory others can write to.
+    The cache is disabled by default, see set_usecache. The key is built from the absolute path,
+    the size and the modification time of the image file, the bioformats_package.jar in
+    use (BFPATH) and the parameters of the call, so a changed file or another BioFormats
+    version never returns stale data. Once the cache grows beyond maxsize bytes, the
+    least recently used entries are removed.
+    """
+
+    def __init__(self, cachedir=CACHEDIR, maxsize=CACHESIZE):
+        self.cachedir = cachedir
+        self.maxsize = maxsize
+
+    @staticmethod
+    def _pathhash(imagefile):
+        return hashlib.sha1(os.path.abspath(imagefile).encode('utf-8')).hexdigest()[:16]
+
+    def _entry(self, imagefile, kind, params):
+        path = os.path.abspath(imagefile)
+        stat = os.stat(path)
+        key = repr((path, stat.st_size, stat.st_mtime, BFPATH, kind, sorted(params.items())))
+        keyhash = hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+        return os.path.join(self.cachedir, self._pathhash(imagefile) + '_' + keyhash + '.pkl')
+
+    def get(self, imagefile, kind, **params):
+        """
+        Return the cached value or None if there is no valid entry.
+        """
+        try:
+            entry = self._entry(imagefile, kind, params)
+            with open(entry, 'rb') as f:
+                value = pickle.load(f)
+            # update the modification time to keep track of the last usage
+            os.utime(entry, None)
+        except Exception:
+            value = None
+
+        return value
+
+    def put(self, imagefile, kind, value, **params):
+        """
+        Store a value inside the cache. Problems writing the cache are reported, but never raised.
+        """
+        try:
+            if not os.path.isdir(self.cachedir):
+                os.makedirs(self.cachedir, mode=0o700)
+            entry = self._entry(imagefile, kind, params)
+            # write to a temporary file first, so concurrent readers never see a partial entry
+            tmpfile = entry + '.' + str(os.getpid()) + '.tmp'
+            with open(tmpfile, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpfile, entry)
+        except Exception:
+            print('Could not write metadata cache entry for:', imagefile, sys.exc_info()[1])
+            return
+
+        self.evict()
+
+    def invalidate(self, imagefile=None):
+        """
+        Remove all entries for imagefile or clear the complete cache if imagefile is None.
+        """
+        if imagefile is None:
+            pattern = '*.pkl'
+        else:
+            pattern = self._pathhash(imagefile) + '_*.pkl'
+
+        for entry in glob.glob(os.path.join(self.cachedir, pattern)):
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache is smaller than maxsize.
+        """
+        entries = []
+        for entry in glob.glob(os.path.join(self.cachedir, '*.pkl')):
+            try:
+                stat = os.stat(entry)
+                entries.append((stat.st_mtime, stat.st_size, entry))
+            except OSError:
+                pass
+
+        totalsize = sum(e[1] for e in entries)
+        for mtime, size, entry in sorted(entries):
+            if totalsize <= self.maxsize:
+                break
+            try:
+                os.remove(entry)
+                totalsize -= size
+            except OSError:
+                pass
+
+    def size(self):
+        """
+        Return the current size of the cache in bytes.
+        """
+        return sum(os.path.getsize(e) for e in glob.glob(os.path.join(self.cachedir, '*.pkl')))
+
+
+# the metadata cache used by get_relevant_metainfo_wrapper and get_planetable
+METACACHE = MetaDataCache(cachedir=CACHEDIR, maxsize=CACHESIZE)
+
+
+def clear_metadata_cache(imagefile=None):
+    """
+    Invalidate the cached metadata for a specific file or clear the complete cache.
+    """
+
+    METACACHE.invalidate(imagefile)
+
+
+def read_plane(rdr, out, series=0, c=0, z=0, t=0, xywh=None):
+    """
+    Read a single plane into out, which is a caller-supplied 2D slice of the target array.
+
+    The raw plane bytes are requested via openBytes and decoded with np.frombuffer using
+    BF2NP_DTYPE and the byte order of the reader. This avoids the additional array, which
+    rdr.read allocates for every plane, so the bytes are copied only once into out.
+
+    With xywh = (x, y, width, height) only this region of the plane is read using
+    openBytesXYWH, so BioFormats only decodes the tiles touching the region.
+
+    For RGB data every plane holds several samples, which count as channels like for
+    getSizeC. The plane of channel c is decoded once and only the sample c is copied.
+    """
+
+    jrdr = rdr.rdr
+
+    if jrdr.getSeries() != series:
+        with _timed('reader.setSeries'):
+            jrdr.setSeries(series)
+
+    # number of samples stored inside every plane - 3 for RGB
+    samples = jrdr.getRGBChannelCount()
+    index = jrdr.getIndex(z, c // samples, t)
+    dtype = np.dtype(BF2NP_DTYPE[jrdr.getPixelType()])
+    if jrdr.isLittleEndian():
+        dtype = dtype.newbyteorder('<')
+    else:
+        dtype = dtype.newbyteorder('>')
+
+    # this is a view on the bytes returned from Java - no copy yet
+    if xywh is None:
+        with _timed('plane.openBytes') as timer:
+            plane = np.frombuffer(jrdr.openBytes(index), dtype=dtype)
+            timer.nbytes = plane.nbytes
+        height, width = jrdr.getSizeY(), jrdr.getSizeX()
+    else:
+        x, y, width, height = xywh
+        with _timed('plane.openBytesXYWH') as timer:
+            plane = np.frombuffer(jrdr.openBytesXYWH(index, x, y, width, height), dtype=dtype)
+            timer.nbytes = plane.nbytes
+
+    with _timed('plane.copy', plane.nbytes):
+        if samples == 1:
+            out[...] = plane.reshape(height, width)
+        elif jrdr.isInterleaved():
+            out[...] = plane.reshape(height, width, samples)[:, :, c % samples]
+        else:
+            out[...] = plane.reshape(samples, height, width)[c % samples]
+
+    return out
+
+
+def estimate_size(sizes, pixeltype):
+    """
+    Estimate the size in bytes of an array with the given dimension sizes. The pixeltype
+    can be a BioFormats pixel type (int), a NumPy dtype or a string like 'uint16'.
+    """
+
+    if isinstance(pixeltype, (int, np.integer)):
+        pixeltype = BF2NP_DTYPE[int(pixeltype)]
+
+    return int(np.prod(sizes, dtype=np.int64)) * np.dtype(pixeltype).itemsize
+
+
+def create_array(sizes, dtype, out=None, backingfile=None, membudget=None):
+    """
+    Create the target array for full-stack reads.
+
+    out         - use an existing array (or np.memmap) with the correct shape and dtype
+    backingfile - create a np.memmap in this file. Files ending with .tif or .tiff are
+                  created using tifffile.memmap, so the result is a valid TIFF file.
+    membudget   - switch to a np.memmap in a temporary file inside MEMMAPDIR if the
+                  estimated size exceeds this number of bytes. Defaults to MEMBUDGET.
+
+    Without any of those options, a np.zeros array is returned.
+    """
+    import tifffile
+
+    sizes = [int(s) for s in sizes]
+
+    if out is not None:
+        if list(out.shape) != sizes or out.dtype != np.dtype(dtype):
+            raise ValueError('The out array must have the shape ' + str(tuple(sizes)) + ' and the dtype ' + str(np.dtype(dtype)) +
+                             ', but has ' + str(out.shape) + ' and ' + str(out.dtype) + '.')
+        return out
+
+    if backingfile is not None:
+        if backingfile.lower().endswith(('.tif', '.tiff')):
+            return tifffile.memmap(backingfile, shape=tuple(sizes), dtype=dtype)
+        return np.memmap(backingfile, mode='w+', shape=tuple(sizes), dtype=dtype)
+
+    if membudget is None:
+        membudget = MEMBUDGET
+
+    if membudget is not None and estimate_size(sizes, dtype) > membudget:
+        print('Estimated size exceeds the memory budget. Using a memory-mapped temporary file.')
+        # the temporary file is removed automatically once the memmap is released
+        return np.memmap(tempfile.TemporaryFile(dir=MEMMAPDIR), mode='w+', shape=tuple(sizes), dtype=dtype)
+
+    return np.zeros(sizes, dtype=dtype)
+
+
+def create_shared_array(sizes, dtype, out=None, backingfile=None):
+    """
+    Create a target array for parallel reads, which all worker processes can map.
+
+    This is always a np.memmap backed by a named file. With out, this must already be such
+    a np.memmap. With backingfile, the file is created like in create_array. Otherwise a
+    temporary file inside MEMMAPDIR is used, see remove_shared_array.
+    """
+
+    if out is not None:
+        if not isinstance(out, np.memmap) or out.filename is None:
+            raise ValueError('For parallel reads the out array must be a np.memmap backed by a named file.')
+        return create_array(sizes, dtype, out=out)
+
+    if backingfile is not None:
+        return create_array(sizes, dtype, backingfile=backingfile)
+
+    tmp = tempfile.NamedTemporaryFile(dir=MEMMAPDIR, prefix='bftools_', suffix='.dat', delete=False)
+    tmp.close()
+
+    return np.memmap(tmp.name, mode='w+', shape=tuple(int(s) for s in sizes), dtype=dtype)
+
+
+def remove_shared_array(array, backingfile=None):
+    # remove the temporary file of a shared array - the memmap itself stays valid on POSIX systems
+
+    if backingfile is not None or array.filename is None:
+        return
+
+    if os.path.basename(array.filename).startswith('bftools_'):
+        try:
+            os.remove(array.filename)
+        except OSError:
+            # on Windows a mapped file cannot be removed, so it is left in MEMMAPDIR
+            pass
+
+
+def _read_units_worker(imagefile, bfpath, targets, units):
+    # runs inside a worker process with its own JVM and reader - returns one error entry per work unit
+
+    set_bfpath(bfpath)
+    JVM.start()
+
+    # map every target array only once
+    arrays = {}
+    errors = []
+
+    rdr = get_reader(imagefile)
+
+    for unitID, target, index, series, t, z, c in units:
+        try:
+            if target not in arrays:
+                filename, offset, shape, dtype = targets[target]
+                arrays[target] = np.memmap(filename, mode='r+', offset=offset, shape=shape, dtype=dtype)
+            read_plane(rdr, arrays[target][index], series=series, c=c, z=z, t=t)
+            errors.append((unitID, None))
+        except:
+            errors.append((unitID, repr(sys.exc_info()[1])))
+
+    release_reader(rdr)
+
+    for array in arrays.values():
+        array.flush()
+
+    return errors
+
+
+def read_planes_parallel(imagefile, arrays, units, num_workers=None, chunksize=None):
+    """
+    Read planes with several worker processes. Every worker starts its own JVM and
+    ImageReader and writes the planes directly into the shared memory-mapped arrays.
+
+    arrays      - list of np.memmap target arrays backed by named files, see create_shared_array
+    units       - list of work units (target, index, series, t, z, c) where target is the
+                  position inside arrays and index is the position of the plane inside that array
+    num_workers - number of worker processes, defaults to the number of CPUs
+    chunksize   - number of planes per task, defaults to about four tasks per worker
+
+    The units are split into consecutive chunks in the given order, so every chunk mostly
+    reads from the same series. The results do not depend on the number of workers.
+
+    Returns the list of read problems as (unit, error) tuples in the order of the units.
+    """
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    if chunksize is None:
+        chunksize = max(1, int(np.ceil(len(units) / float(num_workers * 4))))
+
+    # the workers only need the location of the arrays - the data are never pickled
+    targets = []
+    for array in arrays:
+        array.flush()
+        targets.append((array.filename, array.offset, array.shape, array.dtype.str))
+
+    numbered = [(unitID,) + tuple(unit) for unitID, unit in enumerate(units)]
+    chunks = [numbered[i:i + chunksize] for i in range(0, len(numbered), chunksize)]
+
+    readproblems = []
+
+    # spawn instead of fork, because a forked JVM is not usable
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp.get_context('spawn')) as executor:
+        futures = [executor.submit(_read_units_worker, os.path.abspath(imagefile), BFPATH, targets, chunk)
+                   for chunk in chunks]
+
+        # collect in the order of submission to keep the error report deterministic
+        for chunk, future in zip(chunks, futures):
+            try:
+                errors = future.result()
+            except:
+                # the whole task failed, e.g. the worker could not start its JVM
+                errors = [(unit[0], repr(sys.exc_info()[1])) for unit in chunk]
+
+            for unitID, error in errors:
+                if error is not None:
+                    readproblems.append((units[unitID], error))
+
+    return readproblems
+
+
+def read_planes_threaded(imagefile, arrays, units, num_threads=None, chunksize=None):
+    """
+    Read planes with several threads inside the JVM of this process. Every thread is attached
+    to the JVM and uses its own ImageReader, so the decoding inside Java can run on several cores
+    without the memory cost of one JVM per process.
+
+    arrays      - list of target arrays, any NumPy array can be used
+    units       - list of work units (target, index, series, t, z, c) like for read_planes_parallel
+    num_threads - number of reading threads, defaults to the number of CPUs
+    chunksize   - number of planes taken by a thread at once, defaults to about four chunks per thread
+
+    Every plane is read by exactly one thread. Returns the list of read problems as
+    (unit, error) tuples in the order of the units.
+    """
+
+    JVM.start()
+
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+
+    if chunksize is None:
+        chunksize = max(1, int(np.ceil(len(units) / float(num_threads * 4))))
+
+    chunks = queue.Queue()
+    for i in range(0, len(units), chunksize):
+        chunks.put(range(i, min(i + chunksize, len(units))))
+
+    errors = [None] * len(units)
+
+    def worker():
+
+        jv.attach()
+        try:
+            rdr = None
+            try:
+                rdr = open_reader(imagefile)
+            except Exception as error:
+                # without a reader this thread leaves all planes to the other threads
+                print('Could not open a reader in', threading.current_thread().name, error)
+                return
+
+            try:
+                while True:
+                    try:
+                        chunk = chunks.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    for unitID in chunk:
+                        target, index, series, t, z, c = units[unitID]
+                        try:
+                            read_plane(rdr, arrays[target][index], series=series, c=c, z=z, t=t)
+                        except:
+                            errors[unitID] = repr(sys.exc_info()[1])
+            finally:
+                rdr.close()
+        finally:
+            jv.detach()
+
+    threads = [threading.Thread(target=worker, name='bftools-reader-' + str(i)) for i in range(min(num_threads, chunks.qsize()))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # planes left over by threads, which could not open a reader
+    while not chunks.empty():
+        for unitID in chunks.get_nowait():
+            errors[unitID] = 'not read - no reader available'
+
+    readproblems = [(units[unitID], error) for unitID, error in enumerate(errors) if error is not None]
+
+    return readproblems
+
+
+def select_backend(imagefile, backend=None):
+    """
+    Return the backend used to read the pixel data of imagefile. Default is BACKEND.
+
+    bioformats - always use BioFormats
+    czifile    - use czifile.py for CZI files and BioFormats for everything else
+    tifffile   - use tifffile for OME-TIFF files and BioFormats for everything else
+    auto       - use tifffile for OME-TIFF files and BioFormats for everything else
+
+    Whether a TIFF file is an OME-TIFF is only known after opening it, so plain TIFF files
+    are passed on to BioFormats by read_native.
+    """
+
+    if backend is None:
+        backend = BACKEND
+
+    extension = os.path.splitext(imagefile)[-1].lower()
+
+    if backend == 'auto':
+        if extension in TIFF_EXTENSIONS:
+            return 'tifffile'
+        return 'bioformats'
+
+    if backend == 'czifile' and extension != '.czi':
+        return 'bioformats'
+
+    if backend == 'tifffile' and extension not in TIFF_EXTENSIONS:
+        return 'bioformats'
+
+    return backend
+
+
+def read_native(imagefile, backend, **kwargs):
+    """
+    Read the pixel data using czifile.py or tifffile if the backend selected for imagefile is one of those.
+    The keyword arguments are passed to czitools.read_image6d_czifile or read_image6d_tifffile.
+    Returns None if BioFormats must be used instead.
+    """
+    import czitools as czt
+
+    backend = select_backend(imagefile, backend)
+
+    try:
+        with _timed('native.' + backend) as timer:
+            if backend == 'czifile':
+                img6d = czt.read_image6d_czifile(imagefile, **kwargs)
+            elif backend == 'tifffile':
+                img6d = read_image6d_tifffile(imagefile, **kwargs)
+            else:
+                img6d = None
+            if img6d is not None:
+                timer.nbytes = img6d.nbytes
+    except (NotImplementedError, IndexError, KeyError):
+        print(backend + ' cannot read this file. Using BioFormats instead:', sys.exc_info()[1])
+        img6d = None
+
+    return img6d
+
+
+def _tiff_axes(axes, shape):
+    """
+    Return the positions of T, Z, C, Y and X inside the axes of a tifffile series and the sizes [T, Z, C, Y, X].
+    Samples (S) are treated as channels and generic page axes (I, Q) as z-planes.
+    """
+
+    mapping = {'T': 'T', 'Z': 'Z', 'C': 'C', 'S': 'C', 'I': 'Z', 'Q': 'Z', 'Y': 'Y', 'X': 'X'}
+
+    # all axes with size 1 are skipped, so every target dimension exists only once
+    positions = {}
+    for pos, (ax, size) in enumerate(zip(axes, shape)):
+        target = mapping.get(ax)
+        if target not in ('Y', 'X') and size == 1:
+            continue
+        if target is None or target in positions:
+            raise NotImplementedError('The TIFF axes ' + axes + ' cannot be mapped to TZCYX.')
+        positions[target] = pos
+
+    if 'Y' not in positions or 'X' not in positions:
+        raise NotImplementedError('The TIFF axes ' + axes + ' cannot be mapped to TZCYX.')
+
+    sizes = [shape[positions[target]] if target in positions else 1 for target in 'TZCYX']
+
+    return positions, sizes
+
+
+def _tiff_plane(data, positions, t, z, c, yslice, xslice):
+    # read a single [Y, X] plane from a memmap or zarr array with the original axes of the series
+
+    index = [0] * len(data.shape)
+    for target, value in zip('TZCYX', (t, z, c, yslice, xslice)):
+        if target in positions:
+            index[positions[target]] = value
+
+    plane = data[tuple(index)]
+    if positions['Y'] > positions['X']:
+        plane = plane.T
+
+    return plane
+
+
+def read_image6d_tifffile(imagefile, scenes=None, tindices=None, zindices=None, cindices=None,
+                          xywh=None, allocate=None, series=None):
+    """
+    Read OME-TIFF files using tifffile without BioFormats and the JVM.
+
+    The output has the same layout as get_image6d: [Series, T, Z, C, Y, X]. The dimension
+    order is taken from the OME-XML, every OME image is one series. Other TIFF files raise
+    NotImplementedError, because their series and axes do not always match BioFormats.
+    Uncompressed files are memory-mapped. Compressed or tiled files are accessed through
+    the zarr interface of tifffile, so in both cases only the selected planes and tiles are read.
+    The arguments are the same as for czitools.read_image6d_czifile. BioFormats creates one
+    series per pyramid level, so BioFormats series IDs passed using series are mapped to the
+    tifffile series. Only their full resolution is read by tifffile.
+    """
+    import tifffile
+
+    with tifffile.TiffFile(imagefile) as tif:
+
+        if not tif.is_ome:
+            raise NotImplementedError('Only OME-TIFF files are read by tifffile.')
+
+        if series is not None:
+            levels = [(scene, level) for scene, tiffseries in enumerate(tif.series)
+                      for level in range(len(tiffseries.levels))]
+            scenes = []
+            for seriesID in series:
+                scene, level = levels[seriesID]
+                if level > 0:
+                    raise NotImplementedError('Only the full resolution of pyramidal TIFF files is read by tifffile.')
+                scenes.append(scene)
+
+        if scenes is None:
+            scenes = range(len(tif.series))
+
+        arrays = []
+        for scene in scenes:
+            tiffseries = tif.series[scene]
+            try:
+                # only works for uncompressed and contiguous data
+                data = tifffile.memmap(imagefile, series=scene, mode='r')
+            except ValueError:
+                try:
+                    import zarr
+                    data = zarr.open(tif.aszarr(series=scene, level=0), mode='r')
+                except ImportError:
+                    # without zarr the whole series has to be decoded
+                    data = tiffseries.asarray()
+            arrays.append((data, _tiff_axes(tiffseries.axes, data.shape)))
+
+        shapes = set(tuple(sizes) for data, (positions, sizes) in arrays)
+        if len(shapes) > 1:
+            raise NotImplementedError('The series have different shapes: ' + str(shapes))
+
+        sizeT, sizeZ, sizeC, sizeY, sizeX = arrays[0][1][1]
+        selections = []
+        for indices, size in zip([tindices, zindices, cindices], [sizeT, sizeZ, sizeC]):
+            if indices is None:
+                indices = range(size)
+            selections.append(list(indices))
+
+        if xywh is None:
+            xywh = (0, 0, sizeX, sizeY)
+        x, y, width, height = xywh
+        yslice = slice(y, y + height)
+        xslice = slice(x, x + width)
+
+        shape = [len(arrays)] + [len(sel) for sel in selections] + [height, width]
+        dtype = np.dtype(arrays[0][0].dtype).newbyteorder('=')
+        if allocate is None:
+            out = np.zeros(shape, dtype=dtype)
+        else:
+            out = allocate(shape, dtype)
+
+        for s, (data, (positions, sizes)) in enumerate(arrays):
+            for ti, t in enumerate(selections[0]):
+                for zi, z in enumerate(selections[1]):
+                    for ci, c in enumerate(selections[2]):
+                        out[s, ti, zi, ci] = _tiff_plane(data, positions, t, z, c, yslice, xslice)
+
+    return out
+
+
 def get_metadata_store(imagefile):
 
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
     # get OME-XML and change the encoding to UTF-8
     omexml = get_OMEXML(imagefile)
@@ -106,10 +1246,7 @@ def get_metadata_store(imagefile):
 
 def get_XMLStringfromMetaData(metadata):
 
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
     # get the xml string from the metadata
     xmlstring = metadata.to_xml()
@@ -119,10 +1256,7 @@ def get_XMLStringfromMetaData(metadata):
 
 def get_OMEXML(imagefile):
 
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
     # get OME-XML and change the encoding to UTF-8
     omexml = bioformats.get_omexml_metadata(imagefile)
@@ -132,24 +1266,44 @@ def get_OMEXML(imagefile):
     return omexml
 
 
-def get_java_metadata_store(imagefile):
+def get_OMEXML_from_reader(rdr):
+    """
+    Return the OME-XML from the metadata store of an already initialized reader
+    without parsing the image file again. The reader must have been created by
+    open_reader, so the original metadata are part of the OME-XML.
+    """
+
+    script = """
+    importClass(Packages.loci.common.services.ServiceFactory,
+                Packages.loci.formats.services.OMEXMLService);
+    var service = new ServiceFactory().getInstance(OMEXMLService);
+    service.getOMEXML(metadata);
+    """
+    with _timed('omexml.get') as timer:
+        omexml = jv.run_script(script, dict(metadata=rdr.metadata))
+        omexml = omexml.encode('utf-8')
+        timer.nbytes = len(omexml)
+
+    return omexml
 
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
 
-    # get OME-XML and change the encoding to UTF-8
-    omexml = get_OMEXML(imagefile)
-    # get the metadata from the OME-XML
-    omexmlmetadata = bioformats.OMEXML(omexml)
+def get_java_metadata_store(imagefile, rdr=None, usepool=True):
+    """
+    Return the Java metadata store, the number of series, the imageIDs, the XY dimensions
+    of all series and the multi-resolution flag. An already initialized reader can be
+    passed in using rdr to avoid opening the image file again.
+    """
+
+    JVM.start()
 
     # get the actual image reader
-    rdr = bioformats.get_image_reader(None, path=imagefile)
+    ownreader = rdr is None
+    if ownreader:
+        rdr = get_reader(imagefile, usepool=usepool)
 
     # for "whatever" reason the number of total series can only be accessed here ...
     try:
-        totalseries = np.int(rdr.rdr.getSeriesCount())
+        totalseries = int(rdr.rdr.getSeriesCount())
     except:
         totalseries = 1  # in case there is only ONE series
 
@@ -182,19 +1336,45 @@ def get_java_metadata_store(imagefile):
 
     # rdr.rdr is the actual BioFormats reader. rdr handles its lifetime
     javametadata = jv.JWrapper(rdr.rdr.getMetadataStore())
+    if STATS is not None:
+        javametadata = TimedMetadata(javametadata)
     imagecount = javametadata.getImageCount()
 
     imageIDs = []
     for id in range(0, imagecount):
         imageIDs.append(id)
 
-    rdr.close()
+    if ownreader:
+        release_reader(rdr, usepool=usepool)
 
     # kill_jvm()
 
     return javametadata, totalseries, imageIDs, series_dimensions, multires
 
 
+def get_resolution_counts(rdr):
+    """
+    Return the number of resolution levels of every pyramid as list or None, if the reader
+    does not provide them. The ImageReader flattens the resolutions into series, so the
+    counts are read from the core metadata, where only the full resolution series has
+    a resolutionCount > 1.
+    """
+
+    try:
+        corelist = jv.call(rdr.rdr.o, 'getCoreMetadataList', '()Ljava/util/List;')
+        counts = []
+        seriesID = 0
+        cores = [jv.get_field(core, 'resolutionCount', 'I') for core in jv.iterate_collection(corelist)]
+        while seriesID < len(cores):
+            count = max(1, cores[seriesID])
+            counts.append(count)
+            seriesID += count
+    except:
+        return None
+
+    return counts
+
+
 def get_metainfo_dimension(jmd, MetaInfo, imageID=0):
     """
     Read the actual size for every dimension from the metadata from the 1st image series
@@ -202,11 +1382,11 @@ def get_metainfo_dimension(jmd, MetaInfo, imageID=0):
     dimension order is returned as a string.
     """
 
-    MetaInfo['SizeC'] = np.int(jmd.getPixelsSizeC(imageID).getValue().floatValue())
-    MetaInfo['SizeT'] = np.int(jmd.getPixelsSizeT(imageID).getValue().floatValue())
-    MetaInfo['SizeZ'] = np.int(jmd.getPixelsSizeZ(imageID).getValue().floatValue())
-    MetaInfo['SizeX'] = np.int(jmd.getPixelsSizeX(imageID).getValue().floatValue())
-    MetaInfo['SizeY'] = np.int(jmd.getPixelsSizeY(imageID).getValue().floatValue())
+    MetaInfo['SizeC'] = int(jmd.getPixelsSizeC(imageID).getValue().floatValue())
+    MetaInfo['SizeT'] = int(jmd.getPixelsSizeT(imageID).getValue().floatValue())
+    MetaInfo['SizeZ'] = int(jmd.getPixelsSizeZ(imageID).getValue().floatValue())
+    MetaInfo['SizeX'] = int(jmd.getPixelsSizeX(imageID).getValue().floatValue())
+    MetaInfo['SizeY'] = int(jmd.getPixelsSizeY(imageID).getValue().floatValue())
     # get dimension order string from BioFormats library
     MetaInfo['DimOrder BF'] = jmd.getPixelsDimensionOrder(imageID).getValue()
 
@@ -251,7 +1431,7 @@ def get_metainfo_instrument(jmd, instrumentindex=0):
     try:
         # get the correctinstrument ID
         instrumentIDstr = jmd.getInstrumentID(instrumentindex)
-        instrumentID = np.int(jmd.getInstrumentID(instrumentindex)[-1])
+        instrumentID = int(jmd.getInstrumentID(instrumentindex)[-1])
     except:
         print('No suitable instrumentID found. Using default = 0.')
         instrumentIDstr = 'na'
@@ -260,13 +1440,15 @@ def get_metainfo_instrument(jmd, instrumentindex=0):
     return instrumentIDstr, instrumentID
 
 
-def get_metainfo_objective(jmd, filename, imageID=0):
+def get_metainfo_objective(jmd, filename, imageID=0, cziinfo=None):
+
+    import czitools as czt
 
     try:
         # get the correct objective ID (the objective that was used to acquire the image)
         instrumentIDstr = jmd.getInstrumentID(imageID)
-        instrumentID = np.int(jmd.getInstrumentID(imageID)[-1])
-        objID = np.int(jmd.getObjectiveSettingsID(instrumentID)[-1])
+        instrumentID = int(jmd.getInstrumentID(imageID)[-1])
+        objID = int(jmd.getObjectiveSettingsID(instrumentID)[-1])
         # error handling --> sometime only one objective is there with ID > 0
         numobj = jmd.getObjectiveCount(instrumentID)
         if numobj == 1:
@@ -302,7 +1484,11 @@ def get_metainfo_objective(jmd, filename, imageID=0):
     except:
         print('Try to read objective name via czifile.py')
         # this is a fallback option --> use cziread.py to get the information
-        if filename[-4:] == '.czi':
+        if cziinfo is not None:
+            objmodel = cziinfo['ObjectiveName']
+            if objmodel is None:
+                objmodel = 'na'
+        elif filename[-4:] == '.czi':
             objmodel = czt.get_objective_name_cziread(filename)
             if objmodel is None:
                 objmodel = 'na'
@@ -338,7 +1524,7 @@ def get_metainfo_numscenes(czishape, cziorder):
 
 def get_metainfo_wavelengths(jmd, imageID=0):
 
-    SizeC = np.int(jmd.getPixelsSizeC(imageID).getValue().floatValue())
+    SizeC = int(jmd.getPixelsSizeC(imageID).getValue().floatValue())
 
     # initialize arrays for excitation and emission wavelength
     wl_excitation = np.zeros(SizeC)
@@ -365,10 +1551,7 @@ def get_metainfo_wavelengths(jmd, imageID=0):
 
 def get_dimension_only(imagefile, imageID=0):
 
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
     rdr = bioformats.get_image_reader(None, path=imagefile)
     # read total number of image series
@@ -401,25 +1584,66 @@ def get_dimension_only(imagefile, imageID=0):
     return sizes
 
 
-def get_planetable(imagefile, writecsv=False, separator='\t', imageID=0, showinfo=True):
+def get_planetable(imagefile, writecsv=False, separator='\t', imageID=0, showinfo=True, usecache=None):
+    """
+    Create the planetable containing the XYZ positions and timings for all planes.
+    With usecache=True the planetable is taken from the on-disk metadata cache if the
+    file did not change, which does not require the JVM at all. Default is USECACHE.
+    """
+
+    df = None
+    if usecache is None:
+        usecache = USECACHE
+
+    if usecache:
+        cached = METACACHE.get(imagefile, 'planetable', imageID=imageID)
+        if cached is not None:
+            df, MetaInfo = cached
+
+    if df is None:
+        df, MetaInfo = read_planetable(imagefile, imageID=imageID, showinfo=showinfo)
+        if usecache:
+            METACACHE.put(imagefile, 'planetable', (df, MetaInfo), imageID=imageID)
+
+    if writecsv:
+        csvfile = imagefile[:-4] + '_planetable.csv'
+        # use tab as separator and do not write the index to the CSV data table
+        df.to_csv(csvfile, sep=separator, index=False)
+        print('\nWriting CSV file: ', csvfile)
+    if not writecsv:
+        csvfile = None
+
+    return df, csvfile, MetaInfo
+
+
+def read_planetable(imagefile, imageID=0, showinfo=True, usepool=True):
 
     MetaInfo = create_metainfo_dict()
 
+    JVM.start()
+
+    # the same reader delivers the metadata store and the OME-XML
+    rdr = get_reader(imagefile, usepool=usepool)
+
     # get JavaMetaDataStore and SeriesCount
     try:
         jmd, MetaInfo['TotalSeries'], MetaInfo['ImageIDs'], MetaInfo['SeriesDimensions'], MetaInfo['MultiResolution'] = get_java_metadata_store(
-            imagefile)
+            imagefile, rdr=rdr)
         MetaInfo['XScale'], MetaInfo['YScale'], MetaInfo['ZScale'] = get_metainfo_scaling(jmd)
-        MetaInfo['SizeC'] = np.int(jmd.getPixelsSizeC(imageID).getValue().floatValue())
-        MetaInfo['SizeT'] = np.int(jmd.getPixelsSizeT(imageID).getValue().floatValue())
-        MetaInfo['SizeZ'] = np.int(jmd.getPixelsSizeZ(imageID).getValue().floatValue())
-        MetaInfo['SizeX'] = np.int(jmd.getPixelsSizeX(imageID).getValue().floatValue())
-        MetaInfo['SizeY'] = np.int(jmd.getPixelsSizeY(imageID).getValue().floatValue())
+        MetaInfo['SizeC'] = int(jmd.getPixelsSizeC(imageID).getValue().floatValue())
+        MetaInfo['SizeT'] = int(jmd.getPixelsSizeT(imageID).getValue().floatValue())
+        MetaInfo['SizeZ'] = int(jmd.getPixelsSizeZ(imageID).getValue().floatValue())
+        MetaInfo['SizeX'] = int(jmd.getPixelsSizeX(imageID).getValue().floatValue())
+        MetaInfo['SizeY'] = int(jmd.getPixelsSizeY(imageID).getValue().floatValue())
         MetaInfo['DimOrder BF'] = jmd.getPixelsDimensionOrder(imageID).getValue()
+        omexml = get_OMEXML_from_reader(rdr)
     except:
         print('Problem retrieving Java Metadata Store or Series size:', sys.exc_info()[0])
+        release_reader(rdr, usepool=usepool)
         raise
 
+    release_reader(rdr, usepool=usepool)
+
     # get dimension information and MetaInfo
     #MetaInfo = get_metainfo_dimension(jmd, MetaInfo)
 
@@ -436,87 +1660,166 @@ def get_planetable(imagefile, writecsv=False, separator='\t', imageID=0, showinf
         print('ImageIDs             : ', MetaInfo['ImageIDs'])
         print('\n')
 
-    id = []
-    plane = []
-    xpos = []
-    ypos = []
-    zpos = []
-    dt = []
-    theC = []
-    theZ = []
-    theT = []
-
     print('Start reading the plane data ...')
 
-    import progressbar
-    widgets = [progressbar.Percentage(), progressbar.Bar()]
-    bar = progressbar.ProgressBar(widgets=widgets, max_value=max(MetaInfo['ImageIDs']) + 1).start()
-    #bar = progressbar.ProgressBar().start()
+    with _timed('omexml.planetable', len(omexml)):
+        df = planetable_from_omexml(omexml)
 
-    for imageIndex in range(0, max(MetaInfo['ImageIDs']) + 1):
-        for planeIndex in range(0, MetaInfo['SizeZ'] * MetaInfo['SizeC'] * MetaInfo['SizeT']):
+    return df, MetaInfo
 
-            try:
-                theC.append(jmd.getPlaneTheC(imageIndex, planeIndex).getValue().intValue())
-                theZ.append(jmd.getPlaneTheZ(imageIndex, planeIndex).getValue().intValue())
-                theT.append(jmd.getPlaneTheT(imageIndex, planeIndex).getValue().intValue())
-                xpos.append(jmd.getPlanePositionX(imageIndex, planeIndex).value().doubleValue())
-                ypos.append(jmd.getPlanePositionY(imageIndex, planeIndex).value().doubleValue())
-                zpos.append(jmd.getPlanePositionZ(imageIndex, planeIndex).value().doubleValue())
-
-                dttmp = jmd.getPlaneDeltaT(imageIndex, planeIndex).value().doubleValue()
-                # if dttmp.size == 0:
-                #    dttmp = 0.0
-                dt.append(dttmp)
-                id.append(imageIndex)
-                plane.append(planeIndex)
-            except:
-                print('Could not retrieve plane data for imageIndex, PlaneIndex:', imageIndex, planeIndex)
 
-        # create some kind of progress bar
-        bar.update(imageIndex)
+def planetable_from_omexml(omexml):
+    """
+    Create the planetable from the <Plane> elements of all images inside the OME-XML.
+
+    The OME-XML is streamed only once and the values are written directly into
+    preallocated NumPy columns, which is much faster than querying every plane via
+    the Java metadata store. Attributes missing for a plane are set to NaN.
+    """
+    import pandas as pd
+    from lxml import etree as etl
+
+    # the Pixels elements announce the number of planes, so the columns only grow once per image
+    intcols = ['ImageID', 'Plane', 'TheT', 'TheZ', 'TheC']
+    floatcols = ['PositionX', 'PositionY', 'PositionZ', 'DeltaT']
+    columns = {}
+    for name in intcols:
+        columns[name] = np.zeros(0, dtype=np.int32)
+    for name in floatcols:
+        columns[name] = np.zeros(0, dtype=np.float64)
+
+    capacity = 0
+    numplanes = 0
+    imageindex = -1
+    planeindex = 0
+
+    context = etl.iterparse(BytesIO(omexml), events=('start', 'end'),
+                            tag=('{*}Image', '{*}Pixels', '{*}Plane'))
+
+    for event, elem in context:
+
+        tag = etl.QName(elem).localname
+
+        if event == 'start':
+            if tag == 'Image':
+                imageindex += 1
+                planeindex = 0
+            elif tag == 'Pixels':
+                required = numplanes + int(elem.get('SizeC', 1)) * int(elem.get('SizeZ', 1)) * int(elem.get('SizeT', 1))
+                if required > capacity:
+                    capacity = max(required, 2 * capacity)
+                    _grow_columns(columns, capacity)
+            continue
+
+        if tag == 'Plane':
+            if numplanes == capacity:
+                # more planes than announced by the Pixels element
+                capacity = max(1, 2 * capacity)
+                _grow_columns(columns, capacity)
+
+            columns['ImageID'][numplanes] = imageindex
+            columns['Plane'][numplanes] = planeindex
+            for name in ('TheT', 'TheZ', 'TheC'):
+                columns[name][numplanes] = int(elem.get(name, 0))
+            for name in floatcols:
+                columns[name][numplanes] = float(elem.get(name, 'nan'))
+
+            numplanes += 1
+            planeindex += 1
+
+        # free the memory of elements that were processed already
+        if tag in ('Plane', 'Image'):
+            elem.clear()
+
+    del context
 
     # round the data
-    xpos = np.round(xpos, 1)
-    ypos = np.round(ypos, 1)
-    zpos = np.round(zpos, 1)
-    dt = np.round(dt, 3)
+    xpos = np.round(columns['PositionX'][:numplanes], 1)
+    ypos = np.round(columns['PositionY'][:numplanes], 1)
+    zpos = np.round(columns['PositionZ'][:numplanes], 1)
+    dt = np.round(columns['DeltaT'][:numplanes], 3)
     # normalize plane timings to 0 for the 1st acquired plane
-    dt = dt - dt.min()
+    if numplanes > 0 and not np.all(np.isnan(dt)):
+        dt = dt - np.nanmin(dt)
 
     # create Pandas dataframe to hold the plane data
-    df = pd.DataFrame([np.asarray(id), np.asarray(plane), np.asarray(theT), np.asarray(theZ), np.asarray(theC), xpos, ypos, zpos, dt])
-    df = df.transpose()
-    # give the planetable columns the correct names
-    df.columns = ['ImageID', 'Plane', 'TheT', 'TheZ', 'TheC', 'XPos', 'YPos', 'ZPos', 'DeltaT']
+    df = pd.DataFrame(OrderedDict([('ImageID', columns['ImageID'][:numplanes]),
+                                   ('Plane', columns['Plane'][:numplanes]),
+                                   ('TheT', columns['TheT'][:numplanes]),
+                                   ('TheZ', columns['TheZ'][:numplanes]),
+                                   ('TheC', columns['TheC'][:numplanes]),
+                                   ('XPos', xpos),
+                                   ('YPos', ypos),
+                                   ('ZPos', zpos),
+                                   ('DeltaT', dt)]))
 
-    if writecsv:
-        csvfile = imagefile[:-4] + '_planetable.csv'
-        # use tab as separator and do not write the index to the CSV data table
-        df.to_csv(csvfile, sep=separator, index=False)
-        print('\nWriting CSV file: ', csvfile)
-    if not writecsv:
-        csvfile = None
+    return df
 
-    return df, csvfile, MetaInfo
+
+def _grow_columns(columns, capacity):
+    # enlarge all planetable columns to the new capacity and keep the existing values
+
+    for name, column in columns.items():
+        grown = np.zeros(capacity, dtype=column.dtype)
+        grown[:column.shape[0]] = column
+        columns[name] = grown
 
 
 def get_image6d(imagefile, metainfo,
                 num_levels=1,
                 num_scenes=1,
-                pylevel2read=0):
+                pylevel2read=0,
+                usepool=True,
+                lazy=False,
+                out=None,
+                backingfile=None,
+                membudget=None,
+                backend=None,
+                num_workers=None,
+                num_threads=None):
     """
     This function will read the image data and store them into a 6D numpy array.
     The 6D array has the following dimension order: [Series, T, Z, C, X, Y].
     Pyramid levels start with 0.
+
+    For stacks larger than the RAM, the planes can be written into an existing array (out),
+    a memory-mapped file (backingfile) or a temporary memory-mapped file once the estimated
+    size exceeds membudget. See create_array for details.
+
+    With lazy=True nothing is read yet and a LazyImage6D is returned instead,
+    which only reads the planes touched when it is sliced.
+
+    With backend='czifile' the full resolution of CZI files is read by czifile.py and with
+    backend='tifffile' or 'auto' OME-TIFF files are read by tifffile, both without the JVM.
+    BioFormats is used as fallback for everything those cannot read. See select_backend.
+
+    With num_workers > 1 the planes read by BioFormats are split across this number of worker
+    processes, each with its own JVM. The result is then always a np.memmap, see read_planes_parallel.
+    With num_threads > 1 they are split across this number of threads with their own readers
+    inside the JVM of this process instead, see read_planes_threaded.
     """
 
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    if lazy:
+        img6d = LazyImage6D(imagefile, metainfo,
+                            num_levels=num_levels,
+                            num_scenes=num_scenes,
+                            pylevel2read=pylevel2read,
+                            usepool=usepool)
+
+        return img6d, 'OK'
+
+    if pylevel2read == 0:
+        img6d = read_native(imagefile, backend,
+                             scenes=range(num_scenes),
+                             allocate=lambda shape, dtype: create_array(shape, dtype, out=out,
+                                                                        backingfile=backingfile,
+                                                                        membudget=membudget))
+        if img6d is not None:
+            return img6d, 'OK'
+
+    JVM.start()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
+    rdr = get_reader(imagefile, usepool=usepool)
     # img6d = np.zeros(sizes, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
     # img6d = np.moveaxis(np.zeros(sizes, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()]), 4, 5)
 
@@ -536,7 +1839,33 @@ def get_image6d(imagefile, metainfo,
     new_sizes[4] = xysizes_pylevel[1]
     new_sizes[5] = xysizes_pylevel[0]
 
-    img6d = np.zeros(new_sizes, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
+    if (num_workers is not None and num_workers > 1) or (num_threads is not None and num_threads > 1):
+        units = [(0, (seriesID, timepoint, zplane, channel), series_ids[seriesID], timepoint, zplane, channel)
+                 for seriesID in range(0, num_scenes)
+                 for timepoint in range(0, new_sizes[1])
+                 for zplane in range(0, new_sizes[2])
+                 for channel in range(0, new_sizes[3])]
+
+        if num_workers is not None and num_workers > 1:
+            img6d = create_shared_array(new_sizes, BF2NP_DTYPE[rdr.rdr.getPixelType()],
+                                        out=out, backingfile=backingfile)
+            release_reader(rdr, usepool=usepool)
+            readproblems = read_planes_parallel(imagefile, [img6d], units, num_workers=num_workers)
+            remove_shared_array(img6d, backingfile=backingfile)
+        else:
+            img6d = create_array(new_sizes, BF2NP_DTYPE[rdr.rdr.getPixelType()],
+                                 out=out, backingfile=backingfile, membudget=membudget)
+            release_reader(rdr, usepool=usepool)
+            readproblems = read_planes_threaded(imagefile, [img6d], units, num_threads=num_threads)
+
+        for unit, error in readproblems:
+            print('Problem reading data into Numpy Array for Series', unit[1][0], 'T', unit[3], 'Z', unit[4], 'C', unit[5], error)
+            readstate = 'NOK'
+
+        return img6d, readstate
+
+    img6d = create_array(new_sizes, BF2NP_DTYPE[rdr.rdr.getPixelType()],
+                         out=out, backingfile=backingfile, membudget=membudget)
 
     # main loop to read the images from the data file
     for seriesID in range(0, num_scenes):
@@ -552,33 +1881,211 @@ def get_image6d(imagefile, metainfo,
                         # img6d[seriesID, timepoint, zplane, channel, :, :] = \
                         #    rdr.read(series=seriesID, c=channel, z=zplane, t=timepoint, rescale=False)
 
-                        img6d[seriesID, timepoint, zplane, channel, :, :] = rdr.read(series=sid,
-                                                                                     c=channel,
-                                                                                     z=zplane,
-                                                                                     t=timepoint,
-                                                                                     rescale=False)
-                    except:
-                        print('Problem reading data into Numpy Array for Series', seriesID, sys.exc_info()[1])
-                        readstate = 'NOK'
-                        readproblems = sys.exc_info()[1]
+                        read_plane(rdr, img6d[seriesID, timepoint, zplane, channel, :, :],
+                                   series=sid, c=channel, z=zplane, t=timepoint)
+                    except:
+                        print('Problem reading data into Numpy Array for Series', seriesID, sys.exc_info()[1])
+                        readstate = 'NOK'
+                        readproblems = sys.exc_info()[1]
+
+    release_reader(rdr, usepool=usepool)
+
+    return img6d, readstate
+
+
+class LazyImage6D(object):
+    """
+    Array-like object with the dimension order [Series, T, Z, C, Y, X], which is backed by
+    the reader and reads the planes only on demand.
+
+    Slicing reads only the planes touched by the Series, T, Z and C part of the key and
+    returns a NumPy array. The series / pyramid level mapping is the same as for get_image6d.
+    Index lists are applied independently for every dimension (orthogonal indexing).
+
+    Usage:
+    ------
+
+    img6d, readstate = bf.get_image6d(filename, MetaInfo, lazy=True)
+    print(img6d.shape, img6d.dtype)
+    ch1 = img6d[:, :, :, 1, :, :]
+    img = np.asarray(img6d)
+    """
+
+    ndim = 6
+
+    def __init__(self, imagefile, metainfo,
+                 num_levels=1,
+                 num_scenes=1,
+                 pylevel2read=0,
+                 usepool=True):
+
+        self.imagefile = imagefile
+        self.usepool = usepool
+
+        xysizes_pylevel = metainfo['SeriesDimensions'][pylevel2read]
+        self.series_ids = calc_series_pylevel(metainfo['Sizes'][0],
+                                              num_levels=num_levels,
+                                              num_scenes=num_scenes,
+                                              pylevel=pylevel2read)
+
+        self.shape = (num_scenes,
+                      metainfo['Sizes'][1],
+                      metainfo['Sizes'][2],
+                      metainfo['Sizes'][3],
+                      xysizes_pylevel[1],
+                      xysizes_pylevel[0])
+
+        JVM.start()
+        rdr = get_reader(imagefile, usepool=usepool)
+        self.dtype = np.dtype(BF2NP_DTYPE[rdr.rdr.getPixelType()])
+        release_reader(rdr, usepool=usepool)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return 'LazyImage6D(' + repr(self.imagefile) + ', shape=' + str(self.shape) + ', dtype=' + str(self.dtype) + ')'
+
+    def _normalize_key(self, key):
+        # expand the key to exactly one entry per dimension
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if any(k is Ellipsis for k in key):
+            pos = key.index(Ellipsis)
+            fill = (slice(None),) * (self.ndim - len(key) + 1)
+            key = key[:pos] + fill + key[pos + 1:]
+
+        if len(key) > self.ndim:
+            raise IndexError('too many indices for LazyImage6D')
+
+        return key + (slice(None),) * (self.ndim - len(key))
+
+    @staticmethod
+    def _indices(k, size):
+        # return the selected indices of one dimension and if the dimension is kept
+
+        if isinstance(k, slice):
+            return list(range(*k.indices(size))), True
+
+        if isinstance(k, (int, np.integer)):
+            idx = int(k)
+            if idx < 0:
+                idx += size
+            if idx < 0 or idx >= size:
+                raise IndexError('index ' + str(k) + ' is out of bounds for axis with size ' + str(size))
+            return [idx], False
+
+        indices = []
+        for idx in np.asarray(k).ravel().tolist():
+            if idx < 0:
+                idx += size
+            if idx < 0 or idx >= size:
+                raise IndexError('index ' + str(idx) + ' is out of bounds for axis with size ' + str(size))
+            indices.append(idx)
+
+        return indices, True
+
+    def __getitem__(self, key):
+
+        key = self._normalize_key(key)
+
+        sel = []
+        keep = []
+        for dim in range(4):
+            indices, kept = self._indices(key[dim], self.shape[dim])
+            sel.append(indices)
+            keep.append(kept)
+
+        yxkey = (key[4], key[5])
 
-    rdr.close()
+        # the shape of the YX part is determined by slicing an empty dummy plane
+        yxshape = np.empty(self.shape[4:], dtype=np.bool_)[yxkey].shape
 
-    kill_jvm()
+        # contiguous YX slices are read as a region, everything else is sliced from the full plane
+        xywh = None
+        region = all(isinstance(k, slice) and k.step in (None, 1) for k in yxkey)
+        if region:
+            ystart, ystop, ystep = yxkey[0].indices(self.shape[4])
+            xstart, xstop, xstep = yxkey[1].indices(self.shape[5])
+            if (ystart, ystop, xstart, xstop) != (0, self.shape[4], 0, self.shape[5]):
+                xywh = (xstart, ystart, max(0, xstop - xstart), max(0, ystop - ystart))
+
+        out = np.zeros([len(s) for s in sel] + list(yxshape), dtype=self.dtype)
+        if not region:
+            planebuffer = np.empty(self.shape[4:], dtype=self.dtype)
+
+        # nothing to read for empty selections
+        if out.size == 0:
+            sel = [[], [], [], []]
 
-    return img6d, readstate
+        JVM.start()
+        rdr = get_reader(self.imagefile, usepool=self.usepool)
+
+        try:
+            for si, s in enumerate(sel[0]):
+                for ti, t in enumerate(sel[1]):
+                    for zi, z in enumerate(sel[2]):
+                        for ci, c in enumerate(sel[3]):
+                            if region:
+                                read_plane(rdr, out[si, ti, zi, ci], series=self.series_ids[s], c=c, z=z, t=t, xywh=xywh)
+                            else:
+                                read_plane(rdr, planebuffer, series=self.series_ids[s], c=c, z=z, t=t)
+                                out[si, ti, zi, ci] = planebuffer[yxkey]
+        finally:
+            release_reader(rdr, usepool=self.usepool)
 
+        # remove the dimensions that were selected by an integer
+        dropaxes = tuple(dim for dim in range(4) if not keep[dim])
+        if dropaxes:
+            out = out.reshape([out.shape[dim] for dim in range(out.ndim) if dim not in dropaxes])
 
-def get_zstack(imagefile, sizes, seriesID, timepoints='full', tindex=0):
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+
+        arr = self[...]
+        if dtype is not None:
+            arr = arr.astype(dtype)
+
+        return arr
+
+
+def get_zstack(imagefile, sizes, seriesID, timepoints='full', tindex=0, usepool=True, xywh=None,
+               backend=None):
     """
     This will read a single Z-Stack from an image data set for a specified image series.
+    With xywh = (x, y, width, height) only this region of every plane is read.
+    The backend is selected like for get_image6d.
     """
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
+    if timepoints == 'full':
+        img6d = read_native(imagefile, backend, series=[seriesID], xywh=xywh)
+        if img6d is not None:
+            return img6d[0], 'TZCXY'
+
+    elif timepoints == 'single':
+        img6d = read_native(imagefile, backend, series=[seriesID], tindices=[tindex], xywh=xywh)
+        if img6d is not None:
+            return img6d[0, 0], 'ZCXY'
+
+    JVM.start()
+
+    rdr = get_reader(imagefile, usepool=usepool)
+
+    sizes = list(sizes)
+    if xywh is not None:
+        sizes[4] = xywh[3]
+        sizes[5] = xywh[2]
 
     if timepoints == 'full':
 
@@ -588,7 +2095,8 @@ def get_zstack(imagefile, sizes, seriesID, timepoints='full', tindex=0):
         for timepoint in range(0, sizes[1]):
             for zplane in range(0, sizes[2]):
                 for channel in range(0, sizes[3]):
-                    imgZStack[timepoint, zplane, channel, :, :] = rdr.read(series=seriesID, c=channel, z=zplane, t=timepoint, rescale=False)
+                    read_plane(rdr, imgZStack[timepoint, zplane, channel, :, :], series=seriesID, c=channel, z=zplane, t=timepoint,
+                               xywh=xywh)
 
         dimorder_out = 'TZCXY'
 
@@ -599,11 +2107,11 @@ def get_zstack(imagefile, sizes, seriesID, timepoints='full', tindex=0):
 
         for zplane in range(0, sizes[2]):
             for channel in range(0, sizes[3]):
-                imgZStack[zplane, channel, :, :] = rdr.read(series=seriesID, c=channel, z=zplane, t=tindex, rescale=False)
+                read_plane(rdr, imgZStack[zplane, channel, :, :], series=seriesID, c=channel, z=zplane, t=tindex, xywh=xywh)
 
         dimorder_out = 'ZCXY'
 
-    rdr.close()
+    release_reader(rdr, usepool=usepool)
 
     return imgZStack, dimorder_out
 
@@ -613,8 +2121,15 @@ def write_ometiff(filepath, img6d,
                   scaley=0.1,
                   scalez=1.0,
                   dimorder='STZCYX',
-                  pixeltype='uint16',
-                  swapxyaxes=True):
+                  pixeltype=None,
+                  swapxyaxes=True,
+                  tile=None,
+                  compression=None,
+                  compressionlevel=None,
+                  maxworkers=None,
+                  subresolutions=0,
+                  planetable=None,
+                  channelnames=None):
     """
     This function will write an OME-TIFF file to disk.
     The out 6D array has the following dimension order:
@@ -622,73 +2137,426 @@ def write_ometiff(filepath, img6d,
     [Series, T, Z, C, Y, X] if swapxyaxes = True
 
     [Series, T, Z, C, X, Y] if swapxyaxes = False
+
+    Instead of a 6D array, a list of 5D arrays [T, Z, C, Y, X] can be written, e.g. the
+    output of get_image6d_multires, where every series can have a different size.
+    Every series becomes its own OME Image. The pixels are written as pixeltype, default
+    is the pixel type of the input. The planes are always stored in the order S, T, Z, C,
+    so dimorder must be 'STZCYX'.
+
+    With tile, compression or subresolutions the planes are written by an OMETIFFWriter
+    as tiled, compressed and pyramidal BigTIFF. See OMETIFFWriter for the options.
+
+    The XYZ positions and DeltaT of a planetable and the channel names are added to the
+    OME-XML, which is created by create_omexml.
     """
+    import tifffile
+
+    if dimorder != 'STZCYX':
+        raise ValueError('Only the dimension order STZCYX can be written, use swapxyaxes for [..., X, Y].')
 
-    # Dimension STZCXY
-    if swapxyaxes:
-        # sway xy to write the OME-Stack with the correct shape
-        Series = img6d.shape[0]
-        SizeT = img6d.shape[1]
-        SizeZ = img6d.shape[2]
-        SizeC = img6d.shape[3]
-        SizeX = img6d.shape[5]
-        SizeY = img6d.shape[4]
+    # a list of 5D arrays [T, Z, C, Y, X], e.g. from get_image6d_multires, is written as one series each
+    if isinstance(img6d, (list, tuple)):
+        serieslist = list(img6d)
+    else:
+        serieslist = [img6d[series] for series in range(img6d.shape[0])]
+
+    # keep the pixel type of the data - an explicit pixeltype may lose or truncate values
+    if pixeltype is None:
+        pixeltype = np.result_type(*serieslist)
 
+    # the planes are always stored as [Y, X]
     if not swapxyaxes:
-        Series = img6d.shape[0]
-        SizeT = img6d.shape[1]
-        SizeZ = img6d.shape[2]
-        SizeC = img6d.shape[3]
-        SizeX = img6d.shape[4]
-        SizeY = img6d.shape[5]
-
-    # Getting metadata info
-    omexml = bioformats.omexml.OMEXML()
-    omexml.image(Series - 1).Name = filepath
-
-    for series in range(Series):
-        p = omexml.image(series).Pixels
-        p.ID = str(series)
-        p.SizeX = SizeX
-        p.SizeY = SizeY
-        p.SizeC = SizeC
-        p.SizeT = SizeT
-        p.SizeZ = SizeZ
-        p.PhysicalSizeX = np.float(scalex)
-        p.PhysicalSizeY = np.float(scaley)
-        p.PhysicalSizeZ = np.float(scalez)
-        p.PixelType = pixeltype
-        p.channel_count = SizeC
-        p.plane_count = SizeZ * SizeT * SizeC
-        p = writeOMETIFFplanes(p, SizeT=SizeT, SizeZ=SizeZ, SizeC=SizeC, order=dimorder)
-
-        for c in range(SizeC):
-            if pixeltype == 'unit8':
-                p.Channel(c).SamplesPerPixel = 1
-            if pixeltype == 'unit16':
-                p.Channel(c).SamplesPerPixel = 2
-
-        omexml.structured_annotations.add_original_metadata(bioformats.omexml.OM_SAMPLES_PER_PIXEL, str(SizeC))
-
-    # Converting to omexml
-    xml = omexml.to_xml()
-
-    # write file and save OME-XML as description
-    tifffile.imwrite(filepath, img6d, metadata={'axes': dimorder}, description=xml)
+        serieslist = [np.swapaxes(img5d, 3, 4) for img5d in serieslist]
+
+    sizes = [list(img5d.shape) for img5d in serieslist]
+
+    if tile is not None or compression is not None or subresolutions:
+        with OMETIFFWriter(filepath, sizes=sizes, dtype=pixeltype,
+                           scalex=scalex, scaley=scaley, scalez=scalez,
+                           tile=tile, compression=compression, compressionlevel=compressionlevel,
+                           maxworkers=maxworkers, subresolutions=subresolutions,
+                           planetable=planetable, channelnames=channelnames) as writer:
+            for series, img5d in enumerate(serieslist):
+                for t in range(img5d.shape[0]):
+                    writer.write_zstack(img5d[t], series=series, t=t)
+
+        return filepath
+
+    # create the OME-XML for all planes at once
+    xml = create_omexml(sizes, pixeltype=pixeltype,
+                        scalex=scalex, scaley=scaley, scalez=scalez, name=os.path.basename(filepath),
+                        planetable=planetable, channelnames=channelnames)
+
+    # use BigTIFF if the file can get larger than 4 GB
+    bigtiff = sum(img5d.size for img5d in serieslist) * np.dtype(pixeltype).itemsize > 2 ** 32 - 2 ** 25
+
+    # every series is written as its own consecutive range of IFDs in the order T, Z, C, which
+    # is described by the TiffData elements. So a single series can be read without the others.
+    with tifffile.TiffWriter(filepath, bigtiff=bigtiff) as tif:
+        for series, img5d in enumerate(serieslist):
+            tif.write(img5d.astype(pixeltype, copy=False), photometric='minisblack', metadata=None,
+                      description=xml if series == 0 else None)
 
     return filepath
 
 
-def care_getimages(imagefile, sizes):
+def downsample_plane(plane, factor=2):
+    """
+    Downsample a 2D plane by averaging blocks of factor x factor pixels.
+    Rows and columns not filling a complete block are dropped.
+    """
+
+    sizey = plane.shape[0] // factor
+    sizex = plane.shape[1] // factor
+    blocks = plane[:sizey * factor, :sizex * factor].reshape(sizey, factor, sizex, factor)
+
+    downsampled = blocks.mean(axis=(1, 3))
+    if np.issubdtype(plane.dtype, np.integer):
+        downsampled = np.round(downsampled)
+
+    return downsampled.astype(plane.dtype)
+
+
+# OME pixel types for NumPy dtypes
+NP2OME_TYPE = {
+    'int8': 'int8',
+    'uint8': 'uint8',
+    'int16': 'int16',
+    'uint16': 'uint16',
+    'int32': 'int32',
+    'uint32': 'uint32',
+    'float32': 'float',
+    'float64': 'double'
+}
+
+
+def get_series_sizes(sizes):
+    """
+    Return the sizes [T, Z, C, Y, X] of every series. sizes is either [S, T, Z, C, Y, X] for
+    series of the same size or a list with the sizes [T, Z, C, Y, X] of every series.
+    """
+
+    if len(sizes) == 6 and all(isinstance(size, (int, np.integer)) for size in sizes):
+        return [[int(size) for size in sizes[1:]] for series in range(int(sizes[0]))]
+
+    return [[int(size) for size in seriessizes] for seriessizes in sizes]
+
+
+def create_omexml(sizes, pixeltype='uint16', scalex=0.1, scaley=0.1, scalez=1.0, name='',
+                  planes=None, planetable=None, channelnames=None):
+    """
+    Create the OME-XML for an OME-TIFF file in linear time. All Image, Pixels, Channel, TiffData
+    and Plane elements are generated in bulk from NumPy index arrays instead of walking a DOM.
+
+    sizes        - [S, T, Z, C, Y, X] of the data set or a list with the sizes [T, Z, C, Y, X]
+                   of every series, e.g. for series with different XY sizes
+    pixeltype    - NumPy dtype of the pixels
+    name         - name of the images, the series number is appended
+    planes       - array with one row (series, t, z, c) for every IFD in the order of the IFDs.
+                   Default is one consecutive IFD range per series with the planes in the order
+                   T, Z, C, like written by write_ometiff.
+    planetable   - planetable from get_planetable. PositionX, PositionY, PositionZ and DeltaT
+                   are added to the Plane elements with the same ImageID, TheT, TheZ and TheC.
+    channelnames - list with the names of the channels
+
+    Every series becomes an Image with its own Pixels element.
+    """
+    from xml.sax.saxutils import quoteattr
+
+    seriessizes = np.array(get_series_sizes(sizes), dtype=np.int64).reshape(-1, 5)
+    S = seriessizes.shape[0]
+    sizesT, sizesZ, sizesC = seriessizes[:, 0], seriessizes[:, 1], seriessizes[:, 2]
+
+    # number of planes and the position of the first plane of every series in a flat plane list
+    numplanes = sizesT * sizesZ * sizesC
+    offsets = np.concatenate([[0], np.cumsum(numplanes)])
+
+    if planes is None:
+        # the planes of every series are written in the order T, Z, C, which is DimensionOrder XYCZT
+        indices = [np.indices((1,) + tuple(seriessizes[s, :3])).reshape(4, -1) + np.array([[s], [0], [0], [0]])
+                   for s in range(S)]
+        series, t, z, c = np.concatenate(indices, axis=1) if S > 0 else np.zeros((4, 0), dtype=np.int64)
+        ifds = np.arange(len(series))
+    else:
+        planes = np.asarray(planes, dtype=np.int64).reshape(-1, 4)
+        ifds = np.lexsort((planes[:, 3], planes[:, 2], planes[:, 1], planes[:, 0]))
+        series, t, z, c = planes[ifds].T
+
+    attributes = ['' for i in range(len(ifds))]
+
+    if planetable is not None:
+        # position of every plane inside the flat plane list of all series
+        imageids = planetable['ImageID'].values.astype(np.int64)
+        pt_t = planetable['TheT'].values.astype(np.int64)
+        pt_z = planetable['TheZ'].values.astype(np.int64)
+        pt_c = planetable['TheC'].values.astype(np.int64)
+
+        valid = (imageids >= 0) & (imageids < S)
+        ids = np.where(valid, imageids, 0)
+        valid &= (pt_t < sizesT[ids]) & (pt_z < sizesZ[ids]) & (pt_c < sizesC[ids])
+
+        flat = offsets[ids] + (pt_t * sizesZ[ids] + pt_z) * sizesC[ids] + pt_c
+        plane_flat = offsets[series] + (t * sizesZ[series] + z) * sizesC[series] + c
+
+        for column, attribute, unit in [('XPos', 'PositionX', ' PositionXUnit="&#181;m"'),
+                                        ('YPos', 'PositionY', ' PositionYUnit="&#181;m"'),
+                                        ('ZPos', 'PositionZ', ' PositionZUnit="&#181;m"'),
+                                        ('DeltaT', 'DeltaT', ' DeltaTUnit="s"')]:
+            if column not in planetable:
+                continue
+            values = np.full(offsets[-1], np.nan)
+            values[flat[valid]] = planetable[column].values[valid]
+            # v != v is True for NaN and much faster than np.isnan on single values
+            template = ' ' + attribute + '="%r"' + unit
+            attributes = [a if v != v else a + template % v
+                          for a, v in zip(attributes, values[plane_flat].tolist())]
+
+    pixeltype = NP2OME_TYPE[np.dtype(pixeltype).name]
+
+    # split the plane arrays into the images - they are sorted by series already
+    bounds = np.searchsorted(series, np.arange(S + 1))
+
+    xml = ['<?xml version="1.0" encoding="UTF-8"?>',
+           '<OME xmlns="http://www.openmicroscopy.org/Schemas/OME/2016-06">']
+
+    for s in range(S):
+        T, Z, C, Y, X = seriessizes[s]
+        first, last = bounds[s], bounds[s + 1]
+        if last - first != numplanes[s]:
+            print('Series', s, 'contains', last - first, 'of', numplanes[s], 'planes.')
+
+        xml.append('<Image ID="Image:%d" Name=%s>' % (s, quoteattr(name + ' #%d' % s)))
+        xml.append('<Pixels ID="Pixels:%d" DimensionOrder="XYCZT" Type="%s" SizeX="%d" SizeY="%d" SizeZ="%d" SizeC="%d" SizeT="%d" '
+                   'PhysicalSizeX="%r" PhysicalSizeY="%r" PhysicalSizeZ="%r" BigEndian="false">'
+                   % (s, pixeltype, X, Y, Z, C, T, float(scalex), float(scaley), float(scalez)))
+
+        for ch in range(C):
+            if channelnames is not None and ch < len(channelnames):
+                xml.append('<Channel ID="Channel:%d:%d" Name=%s SamplesPerPixel="1"/>' % (s, ch, quoteattr(str(channelnames[ch]))))
+            else:
+                xml.append('<Channel ID="Channel:%d:%d" SamplesPerPixel="1"/>' % (s, ch))
+
+        rows = list(zip(ifds[first:last].tolist(), t[first:last].tolist(), z[first:last].tolist(), c[first:last].tolist()))
+
+        xml.extend(['<TiffData IFD="%d" FirstT="%d" FirstZ="%d" FirstC="%d" PlaneCount="1"/>' % row for row in rows])
+        xml.extend(['<Plane TheT="%d" TheZ="%d" TheC="%d"%s/>' % (row[1], row[2], row[3], a)
+                    for row, a in zip(rows, attributes[first:last])])
+
+        xml.append('</Pixels>')
+        xml.append('</Image>')
+
+    xml.append('</OME>')
+
+    return ''.join(xml)
+
+
+class OMETIFFWriter(object):
+    """
+    Streaming OME-TIFF writer. Planes are written to a BigTIFF file as soon as they arrive, so only
+    one plane or Z-stack has to be in memory. The OME-XML is finalized when the writer is closed.
+
+    sizes    - [S, T, Z, C, Y, X] of the data set or a list with the sizes [T, Z, C, Y, X] of every
+               series, see get_series_sizes. If None, the sizes and the dtype are taken from the
+               written planes when the writer is closed. Series can have different XY sizes.
+    scalex, scaley, scalez - pixel size in micron
+
+    tile            - write tiles with this (height, width) instead of strips, e.g. (256, 256)
+    compression     - compression codec like 'zlib', 'lzw' or 'zstd'
+    compressionlevel - level for the compression codec
+    maxworkers      - number of threads encoding the tiles of a plane in parallel
+    subresolutions  - number of downsampled pyramid levels stored as SubIFDs of every plane or
+                      'auto' to add levels until the plane fits into a single tile (256 without tiles)
+    downscale       - factor between two pyramid levels
+    planetable, channelnames - additional metadata, see create_omexml
+    name            - name of the images in the OME-XML, default is the file name
+
+    The planes can be written in any order. Every plane is mapped to its IFD using
+    the TiffData elements of the OME-XML. The pyramid levels are found by OME readers
+    in the SubIFDs, so they do not need any additional OME-XML.
+
+    Usage:
+    ------
+
+    with bf.OMETIFFWriter('output.ome.tiff') as writer:
+        writer.write_planes(bf.iterate_planes(filename))
+    """
+
+    def __init__(self, filepath, sizes=None, dtype=None, scalex=0.1, scaley=0.1, scalez=1.0, bigtiff=True,
+                 tile=None, compression=None, compressionlevel=None, maxworkers=None,
+                 subresolutions=0, downscale=2, planetable=None, channelnames=None, name=None):
+        import tifffile
+
+        self.filepath = filepath
+        self.name = os.path.basename(filepath) if name is None else name
+        self.sizes = None if sizes is None else get_series_sizes(sizes)
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.scalex = scalex
+        self.scaley = scaley
+        self.scalez = scalez
+        self.subresolutions = subresolutions
+        self.downscale = downscale
+        self.planetable = planetable
+        self.channelnames = channelnames
+
+        # options passed to tifffile for every page
+        self.options = {'photometric': 'minisblack', 'metadata': None}
+        if tile is not None:
+            self.options['tile'] = tuple(tile)
+        if compression is not None:
+            self.options['compression'] = compression
+            if compressionlevel is not None:
+                self.options['compressionargs'] = {'level': compressionlevel}
+        if maxworkers is not None:
+            self.options['maxworkers'] = maxworkers
+
+        # one entry (series, t, z, c) for every written IFD and the plane shape of every series
+        self.planes = []
+        self._written = set()
+        self._planeshapes = {}
+        self._tif = tifffile.TiffWriter(filepath, bigtiff=bigtiff)
+
+    def write_plane(self, plane, series=0, t=0, z=0, c=0):
+        """
+        Append a single 2D plane [Y, X].
+        """
+
+        if self._tif is None:
+            raise ValueError('The OMETIFFWriter is closed already.')
+
+        plane = np.asarray(plane)
+        if plane.ndim != 2:
+            raise ValueError('Only 2D planes can be written, but the plane has the shape ' + str(plane.shape) + '.')
+
+        if self.dtype is None:
+            self.dtype = plane.dtype
+
+        key = (int(series), int(t), int(z), int(c))
+        if self.sizes is not None:
+            if not 0 <= key[0] < len(self.sizes) or not all(0 <= i < size for i, size in zip(key[1:], self.sizes[key[0]][:3])):
+                raise ValueError('The plane series=%d, t=%d, z=%d, c=%d is outside of the sizes.' % key)
+            planeshape = tuple(self.sizes[key[0]][3:5])
+        else:
+            # the first plane of a series defines the shape of all its planes
+            planeshape = self._planeshapes.setdefault(key[0], plane.shape)
+        if plane.shape != planeshape:
+            raise ValueError('The planes of series ' + str(key[0]) + ' must have the shape ' + str(planeshape) +
+                             ', but the plane has ' + str(plane.shape) + '.')
+
+        if key in self._written:
+            raise ValueError('The plane series=%d, t=%d, z=%d, c=%d was written already.' % key)
+
+        # the first page carries a placeholder, which is replaced by the OME-XML on close
+        if not self.planes:
+            description = 'OME-XML will be written on close'
+        else:
+            description = None
+
+        plane = plane.astype(self.dtype, copy=False)
+        levels = self.get_levels(plane.shape)
+
+        self._tif.write(plane, description=description, subifds=levels or None, **self.options)
+
+        # the pyramid levels of this plane go into its SubIFDs
+        for level in range(levels):
+            plane = downsample_plane(plane, self.downscale)
+            self._tif.write(plane, subfiletype=1, **self.options)
+
+        self.planes.append(key)
+        self._written.add(key)
+
+    def write_zstack(self, zstack, series=0, t=0):
+        """
+        Append a Z-stack with the shape [Z, C, Y, X].
+        """
+
+        for z in range(zstack.shape[0]):
+            for c in range(zstack.shape[1]):
+                self.write_plane(zstack[z, c], series=series, t=t, z=z, c=c)
+
+    def write_planes(self, planes):
+        """
+        Append all (series, t, z, c, plane) tuples, e.g. from iterate_planes.
+        """
+
+        for series, t, z, c, plane in planes:
+            self.write_plane(plane, series=series, t=t, z=z, c=c)
+
+    def get_levels(self, planeshape):
+        """
+        Return the number of pyramid levels written for planes with the shape [Y, X].
+        """
+
+        if self.subresolutions != 'auto':
+            return int(self.subresolutions)
+
+        tilesize = max(self.options.get('tile', (256, 256)))
+        levels = 0
+        while max(planeshape) > tilesize:
+            planeshape = [size // self.downscale for size in planeshape]
+            levels += 1
+
+        return levels
+
+    def _get_sizes(self):
+        # the sizes [T, Z, C, Y, X] of every series - taken from the written planes if not specified
+
+        if self.sizes is not None:
+            return self.sizes
+
+        planes = np.array(self.planes)
+        sizes = []
+        for series in range(planes[:, 0].max() + 1):
+            indices = planes[planes[:, 0] == series, 1:]
+            if len(indices) == 0:
+                sizes.append([0, 0, 0, 0, 0])
+                continue
+            sizes.append([int(i) for i in indices.max(axis=0) + 1] + list(self._planeshapes[series]))
+
+        return sizes
+
+    def get_omexml(self):
+        """
+        Create the OME-XML describing all written planes, see create_omexml.
+        """
+
+        return create_omexml(self._get_sizes(), pixeltype=self.dtype,
+                             scalex=self.scalex, scaley=self.scaley, scalez=self.scalez,
+                             name=self.name, planes=self.planes,
+                             planetable=self.planetable, channelnames=self.channelnames)
+
+    def close(self):
+        """
+        Write the final OME-XML into the first page and close the file.
+        """
+
+        if self._tif is None:
+            return
+
+        import tifffile
+
+        self._tif.close()
+        self._tif = None
+
+        # replace the placeholder in the first page - this also works for pages with SubIFDs
+        if self.planes:
+            tifffile.tiffcomment(self.filepath, comment=self.get_omexml())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def care_getimages(imagefile, sizes, usepool=True):
     """
     Still experimental. Use at your own risk !!!
     """
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
+    rdr = get_reader(imagefile, usepool=usepool)
     img_care = np.zeros(sizes, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
     readstate = 'OK'
     readproblems = []
@@ -697,13 +2565,13 @@ def care_getimages(imagefile, sizes):
     for seriesID in range(0, sizes[0]):
         for channel in range(0, sizes[3]):
             try:
-                img_care[seriesID, :, :, channel] = rdr.read(series=seriesID, c=channel, z=0, t=0, rescale=False)
+                read_plane(rdr, img_care[seriesID, :, :, channel], series=seriesID, c=channel, z=0, t=0)
             except:
                 print('Problem reading data into Numpy Array for Series', seriesID, sys.exc_info()[1])
                 readstate = 'NOK'
                 readproblems = sys.exc_info()[1]
 
-    rdr.close()
+    release_reader(rdr, usepool=usepool)
 
     return img_care, readstate
 
@@ -712,20 +2580,24 @@ def get_image6d_subset(imagefile, sizes,
                        seriesstart=0, seriesend=0,
                        tstart=0, tend=0,
                        zstart=0, zend=0,
-                       chstart=0, chend=0):
+                       chstart=0, chend=0,
+                       usepool=True,
+                       out=None,
+                       backingfile=None,
+                       membudget=None,
+                       xywh=None):
     """
 
     Attention: Still Experimental !!!
 
     This function will read a subset of the image file store them into a 6D numpy array.
     The 6D array has the following dimension order: [Series, T, Z, C, X, Y].
+    With xywh = (x, y, width, height) only this region of every plane is read.
+    The options out, backingfile and membudget work like for get_image6d.
     """
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
+    rdr = get_reader(imagefile, usepool=usepool)
 
     subsetSizeS = seriesend - seriesstart
     subsetSizeT = tend - tstart
@@ -733,8 +2605,12 @@ def get_image6d_subset(imagefile, sizes,
     subsetSizeC = chend - chstart
 
     subsetsizes = [subsetSizeS, subsetSizeT, subsetSizeZ, subsetSizeC, sizes[4], sizes[5]]
+    if xywh is not None:
+        subsetsizes[4] = xywh[3]
+        subsetsizes[5] = xywh[2]
 
-    img6dsubset = np.zeros(subsetsizes, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
+    img6dsubset = create_array(subsetsizes, BF2NP_DTYPE[rdr.rdr.getPixelType()],
+                               out=out, backingfile=backingfile, membudget=membudget)
     readstate = 'OK'
     readproblems = []
 
@@ -744,30 +2620,29 @@ def get_image6d_subset(imagefile, sizes,
             for zplane in range(zstart, zend):
                 for channel in range(chstart, chend):
                     try:
-                        img6dsubset[seriesID, timepoint, zplane, channel, :, :] =\
-                            rdr.read(series=seriesID, c=channel, z=zplane, t=timepoint, rescale=False)
+                        read_plane(rdr, img6dsubset[seriesID - seriesstart, timepoint - tstart, zplane - zstart, channel - chstart, :, :],
+                                   series=seriesID, c=channel, z=zplane, t=timepoint, xywh=xywh)
                     except:
                         print('Problem reading data into Numpy Array for Series', seriesID, sys.exc_info()[1])
                         readstate = 'NOK'
                         readproblems = sys.exc_info()[1]
 
-    rdr.close()
+    release_reader(rdr, usepool=usepool)
 
     return img6dsubset, readstate
 
 
-def get_image6d_multires(imagefile, MetaInfo):
+def get_image6d_multires(imagefile, MetaInfo, usepool=True, num_workers=None, num_threads=None):
     """
     This function will read the image data series by series.
     Every series will be stored inside a tuple as a 5D numpy array.
-    The 5D array has the following dimension order: [T, Z, C, X, Y].
+    The 5D array has the following dimension order: [T, Z, C, Y, X].
+    With num_workers > 1 all series are read in parallel into np.memmap arrays.
+    With num_threads > 1 all series are read by several threads inside this JVM.
     """
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
+    rdr = get_reader(imagefile, usepool=usepool)
 
     readstate = 'OK'
     readproblems = []
@@ -780,12 +2655,42 @@ def get_image6d_multires(imagefile, MetaInfo):
     sizeZ = MetaInfo['Sizes'][2]
     sizeC = MetaInfo['Sizes'][3]
 
+    parallel = num_workers is not None and num_workers > 1
+
+    if parallel or (num_threads is not None and num_threads > 1):
+        units = []
+        for seriesID in range(0, numseries):
+            newsize = [sizeT, sizeZ, sizeC, MetaInfo['SeriesDimensions'][seriesID][1], MetaInfo['SeriesDimensions'][seriesID][0]]
+            if parallel:
+                series_list.append(create_shared_array(newsize, BF2NP_DTYPE[rdr.rdr.getPixelType()]))
+            else:
+                series_list.append(np.zeros(newsize, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()]))
+            units += [(seriesID, (timepoint, zplane, channel), seriesID, timepoint, zplane, channel)
+                      for timepoint in range(0, sizeT)
+                      for zplane in range(0, sizeZ)
+                      for channel in range(0, sizeC)]
+
+        release_reader(rdr, usepool=usepool)
+
+        if parallel:
+            readproblems = read_planes_parallel(imagefile, series_list, units, num_workers=num_workers)
+            for img5d in series_list:
+                remove_shared_array(img5d)
+        else:
+            readproblems = read_planes_threaded(imagefile, series_list, units, num_threads=num_threads)
+
+        for unit, error in readproblems:
+            print('Problem reading data into Numpy Array for Series', unit[2], 'T', unit[3], 'Z', unit[4], 'C', unit[5], error)
+            readstate = 'NOK'
+
+        return series_list, readstate
+
     for seriesID in range(0, numseries):
         # read the XY dimension of the first series
         current_sizeX = MetaInfo['SeriesDimensions'][seriesID][0]
         current_sizeY = MetaInfo['SeriesDimensions'][seriesID][1]
 
-        newsize = [sizeT, sizeZ, sizeC, current_sizeX, current_sizeY]
+        newsize = [sizeT, sizeZ, sizeC, current_sizeY, current_sizeX]
 
         # create the 5D numpy array
         img5d = np.zeros(newsize, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
@@ -795,8 +2700,8 @@ def get_image6d_multires(imagefile, MetaInfo):
             for zplane in range(0, sizeZ):
                 for channel in range(0, sizeC):
                     try:
-                        img5d[timepoint, zplane, channel, :, :] =\
-                            rdr.read(series=seriesID, c=channel, z=zplane, t=timepoint, rescale=False)
+                        read_plane(rdr, img5d[timepoint, zplane, channel, :, :],
+                                   series=seriesID, c=channel, z=zplane, t=timepoint)
                     except:
                         print('Problem reading data into Numpy Array for Series', seriesID, sys.exc_info()[1])
                         readstate = 'NOK'
@@ -807,31 +2712,25 @@ def get_image6d_multires(imagefile, MetaInfo):
         # clear the array from memory
         img5d = None
 
-    rdr.close()
-
-    kill_jvm()
+    release_reader(rdr, usepool=usepool)
 
     return series_list, readstate
 
 
-def get_image6d_pylevel(imagefile, MetaInfo, pylevel=0):
+def get_image6d_pylevel(imagefile, MetaInfo, pylevel=0, usepool=True, scene=0):
     """
-    This function will read the image data only at a specific pyramid level.
-    Every series will be stored inside a tuple as a 5D numpy array.
-    The 6D array has the following dimension order: [T, Z, C, X, Y].
+    This function will read the image data only at a specific pyramid level of a scene.
+    The 6D array has the following dimension order: [1, T, Z, C, Y, X].
     """
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
+    rdr = get_reader(imagefile, usepool=usepool)
 
     print('Reading MultiRes File.')
     readstate = 'OK'
     readproblems = []
 
-    seriesID = pylevel
+    seriesID = get_pyramid_series(MetaInfo)[scene][pylevel]
     sizeT = MetaInfo['Sizes'][1]
     sizeZ = MetaInfo['Sizes'][2]
     sizeC = MetaInfo['Sizes'][3]
@@ -853,59 +2752,262 @@ def get_image6d_pylevel(imagefile, MetaInfo, pylevel=0):
         for zplane in range(0, sizeZ):
             for channel in range(0, sizeC):
                 try:
-                    img6d[seriesID, timepoint, zplane, channel, :, :] =\
-                        rdr.read(series=seriesID, c=channel, z=zplane, t=timepoint, rescale=False)
+                    read_plane(rdr, img6d[0, timepoint, zplane, channel, :, :],
+                               series=seriesID, c=channel, z=zplane, t=timepoint)
                 except:
                     print('Problem reading data into Numpy Array for Series', seriesID, sys.exc_info()[1])
                     readstate = 'NOK'
                     readproblems = sys.exc_info()[1]
 
-    rdr.close()
-
-    kill_jvm()
+    release_reader(rdr, usepool=usepool)
 
     return img6d, readstate
 
 
-def get_image2d(imagefile, seriesID, channel, zplane, timepoint):
+def get_image6d_resolution(imagefile, MetaInfo, pixelsize=None, maxshape=None, scenes=None, usepool=True):
+    """
+    Read every scene at the coarsest pyramid level, which is still sufficient for the
+    target pixel size in microns or fits inside maxshape (Y, X), see select_pylevel.
+    Only the selected levels are read, so an overview of a slide scan never touches
+    the full resolution.
+    Returns a list with a 5D numpy array [T, Z, C, Y, X] for every scene, the readstate
+    and the selection, which contains the series, the level and the pixel size of every scene.
+    """
+    JVM.start()
+
+    selection = select_pylevel(MetaInfo, pixelsize=pixelsize, maxshape=maxshape, scenes=scenes)
+
+    rdr = get_reader(imagefile, usepool=usepool)
+
+    readstate = 'OK'
+    series_list = []
+
+    sizeT = MetaInfo['Sizes'][1]
+    sizeZ = MetaInfo['Sizes'][2]
+    sizeC = MetaInfo['Sizes'][3]
+
+    for sceneID, seriesID, pylevel, shape, scaling in selection:
+
+        img5d = np.zeros([sizeT, sizeZ, sizeC, shape[0], shape[1]], dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
+
+        for timepoint in range(0, sizeT):
+            for zplane in range(0, sizeZ):
+                for channel in range(0, sizeC):
+                    try:
+                        read_plane(rdr, img5d[timepoint, zplane, channel, :, :],
+                                   series=seriesID, c=channel, z=zplane, t=timepoint)
+                    except:
+                        print('Problem reading data into Numpy Array for Series', seriesID, sys.exc_info()[1])
+                        readstate = 'NOK'
+
+        series_list.append(img5d)
+
+    release_reader(rdr, usepool=usepool)
+
+    return series_list, readstate, selection
+
+
+def get_image2d(imagefile, seriesID, channel, zplane, timepoint, usepool=True, xywh=None,
+                backend=None):
     """
     This will just read a single plane from an image data set.
+    With xywh = (x, y, width, height) only this region of the plane is read.
+    The backend is selected like for get_image6d.
     """
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
-    img2d = rdr.read(series=seriesID, c=channel, z=zplane, t=timepoint, rescale=False)
+    img6d = read_native(imagefile, backend, series=[seriesID], tindices=[timepoint],
+                         zindices=[zplane], cindices=[channel], xywh=xywh)
+    if img6d is not None:
+        return img6d[0, 0, 0, 0]
 
-    rdr.close()
+    JVM.start()
+
+    rdr = get_reader(imagefile, usepool=usepool)
+    rdr.rdr.setSeries(seriesID)
+    if xywh is None:
+        planeshape = (rdr.rdr.getSizeY(), rdr.rdr.getSizeX())
+    else:
+        planeshape = (xywh[3], xywh[2])
+    img2d = np.empty(planeshape, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
+    read_plane(rdr, img2d, series=seriesID, c=channel, z=zplane, t=timepoint, xywh=xywh)
+
+    release_reader(rdr, usepool=usepool)
 
     return img2d
 
 
-def get_series_from_well(imagefile, sizes, seriesseq):
+def native_plane_order(dimorder, sizeZ, sizeC, sizeT):
+    """
+    Return the (z, c, t) coordinates of all planes in the order they are stored inside the file.
+    dimorder is the BioFormats dimension order, e.g. 'XYCZT' means C changes fastest.
+    """
+
+    sizes = {'Z': sizeZ, 'C': sizeC, 'T': sizeT}
+    # the last character is the outermost loop
+    inner, middle, outer = dimorder[2], dimorder[3], dimorder[4]
+
+    coords = []
+    for o in range(sizes[outer]):
+        for m in range(sizes[middle]):
+            for i in range(sizes[inner]):
+                pos = {outer: o, middle: m, inner: i}
+                coords.append((pos['Z'], pos['C'], pos['T']))
+
+    return coords
+
+
+def _put_item(planequeue, item, stop):
+    # put an item into the queue, but give up once the consumer stopped
+
+    while not stop.is_set():
+        try:
+            planequeue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+
+    return False
+
+
+def iterate_planes(imagefile, series=None, prefetch=4, xywh=None):
+    """
+    Generator yielding (series, t, z, c, plane) for all planes in the native plane order of the file.
+
+    A background thread attached to the JVM reads the upcoming planes into a queue
+    holding up to prefetch planes, so processing a plane overlaps with decoding the next ones.
+    series can be a single series index or a list of indices. Default is all series.
+    With xywh = (x, y, width, height) only this region of every plane is read.
+    The background thread uses its own reader, so other calls for the same file
+    can use the pooled reader meanwhile.
+
+    Usage:
+    ------
+
+    for s, t, z, c, plane in bf.iterate_planes(filename, prefetch=8):
+        result = process(plane)
+    """
+
+    JVM.start()
+
+    planequeue = queue.Queue(maxsize=max(1, prefetch))
+    stop = threading.Event()
+    done = object()
+
+    def producer():
+
+        jv.attach()
+        try:
+            # not the pooled reader - setSeries from another call would change the planes read here
+            rdr = open_reader(imagefile)
+            try:
+                if series is None:
+                    seriesids = range(rdr.rdr.getSeriesCount())
+                elif isinstance(series, (int, np.integer)):
+                    seriesids = [series]
+                else:
+                    seriesids = series
+
+                for s in seriesids:
+                    jrdr = rdr.rdr
+                    jrdr.setSeries(s)
+                    dtype = BF2NP_DTYPE[jrdr.getPixelType()]
+                    if xywh is None:
+                        planeshape = (jrdr.getSizeY(), jrdr.getSizeX())
+                    else:
+                        planeshape = (xywh[3], xywh[2])
+
+                    coords = native_plane_order(jrdr.getDimensionOrder(),
+                                                jrdr.getSizeZ(), jrdr.getSizeC(), jrdr.getSizeT())
+
+                    for z, c, t in coords:
+                        if stop.is_set():
+                            return
+                        plane = np.empty(planeshape, dtype=dtype)
+                        read_plane(rdr, plane, series=s, c=c, z=z, t=t, xywh=xywh)
+                        if not _put_item(planequeue, (s, t, z, c, plane), stop):
+                            return
+            finally:
+                rdr.close()
+
+        except Exception as error:
+            _put_item(planequeue, ('error', error), stop)
+
+        finally:
+            _put_item(planequeue, done, stop)
+            jv.detach()
+
+    thread = threading.Thread(target=producer, name='bftools-prefetch')
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            item = planequeue.get()
+            if item is done:
+                break
+            if item[0] == 'error':
+                raise item[1]
+            yield item
+    finally:
+        # stop the producer if the consumer leaves early
+        stop.set()
+        thread.join()
+
+
+def get_well_units(sizes, seriesseq):
+    """
+    Return the work units (target, index, series, t, z, c) for reading the scenes of a well.
+    seriesseq contains the series IDs of the scenes inside the file, index is the position
+    [scene of the well, t, z, c] inside the array of the well.
+    """
+
+    return [(0, (position, timepoint, zplane, channel), seriesID, timepoint, zplane, channel)
+            for position, seriesID in enumerate(seriesseq)
+            for timepoint in range(0, sizes[1])
+            for zplane in range(0, sizes[2])
+            for channel in range(0, sizes[3])]
+
+
+def get_series_from_well(imagefile, sizes, seriesseq, usepool=True,
+                         out=None, backingfile=None, membudget=None, num_workers=None, num_threads=None):
     """
     Reads all scenes from a single well and stores them in a array.
+    The options out, backingfile, membudget, num_workers and num_threads work like for get_image6d.
     """
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
-    rdr = bioformats.ImageReader(imagefile, perform_init=True)
+    rdr = get_reader(imagefile, usepool=usepool)
     sizes[0] = len(seriesseq)
 
-    img6dwell = np.zeros(sizes, dtype=BF2NP_DTYPE[rdr.rdr.getPixelType()])
+    # the scenes of the well are the series seriesseq of the file
+    units = get_well_units(sizes, seriesseq)
 
-    for seriesID in range(0, len(seriesseq)):
-        for timepoint in range(0, sizes[1]):
-            for zplane in range(0, sizes[2]):
-                for channel in range(0, sizes[3]):
-                    img6dwell[seriesID, timepoint, zplane, channel, :, :] =\
-                        rdr.read(series=seriesID, c=channel, z=zplane, t=timepoint, rescale=False)
+    if (num_workers is not None and num_workers > 1) or (num_threads is not None and num_threads > 1):
 
-    rdr.close()
+        if num_workers is not None and num_workers > 1:
+            img6dwell = create_shared_array(sizes, BF2NP_DTYPE[rdr.rdr.getPixelType()],
+                                            out=out, backingfile=backingfile)
+            release_reader(rdr, usepool=usepool)
+            readproblems = read_planes_parallel(imagefile, [img6dwell], units, num_workers=num_workers)
+            remove_shared_array(img6dwell, backingfile=backingfile)
+        else:
+            img6dwell = create_array(sizes, BF2NP_DTYPE[rdr.rdr.getPixelType()],
+                                     out=out, backingfile=backingfile, membudget=membudget)
+            release_reader(rdr, usepool=usepool)
+            readproblems = read_planes_threaded(imagefile, [img6dwell], units, num_threads=num_threads)
+
+        for unit, error in readproblems:
+            print('Problem reading data into Numpy Array for Series', unit[2], 'T', unit[3], 'Z', unit[4], 'C', unit[5], error)
+
+        return img6dwell
+
+    img6dwell = create_array(sizes, BF2NP_DTYPE[rdr.rdr.getPixelType()],
+                             out=out, backingfile=backingfile, membudget=membudget)
+
+    for target, index, seriesID, timepoint, zplane, channel in units:
+        read_plane(rdr, img6dwell[index], series=seriesID, c=channel, z=zplane, t=timepoint)
+
+    release_reader(rdr, usepool=usepool)
 
     return img6dwell
 
@@ -947,6 +3049,7 @@ def create_metainfo_dict():
                 'ImageIDs': [],
                 'SeriesDimensions': [],
                 'MutiResolution': False,
+                'ResolutionCounts': None,
                 'PyLevels': None,
                 'NumScenes': None}
 
@@ -957,39 +3060,80 @@ def get_relevant_metainfo_wrapper(imagefile,
                                   namespace='http://www.openmicroscopy.org/Schemas/OME/2016-01',
                                   bfpath=r'bfpackage/5.9.2/bioformats_package.jar',
                                   showinfo=False,
-                                  xyorder='YX'):
+                                  xyorder='YX',
+                                  usepool=True,
+                                  usecache=None):
+    """
+    Collect the relevant meta-information in a single pass. The image file is opened only
+    once by BioFormats and once by czifile (CZI only) and the OME-XML is parsed only once.
+    With usecache=True the result is taken from the on-disk metadata cache if the file
+    did not change, which does not require the JVM at all. Default is USECACHE.
+    """
+    import czitools as czt
+    from lxml import etree as etl
+
+    if usecache is None:
+        usecache = USECACHE
+
+    if usecache:
+        MetaInfo = METACACHE.get(imagefile, 'metainfo', namespace=namespace, xyorder=xyorder)
+        if MetaInfo is not None:
+            if showinfo:
+                showtypicalmetadata(MetaInfo)
+            return MetaInfo
 
     MetaInfo = create_metainfo_dict()
-    omexml = get_OMEXML(imagefile)
 
     MetaInfo['Directory'] = os.path.dirname(imagefile)
     MetaInfo['Filename'] = os.path.basename(imagefile)
 
+    JVM.start()
+
+    # the reader is shared by all BioFormats based steps below
+    rdr = get_reader(imagefile, usepool=usepool)
+
+    # get the OME-XML from the reader and parse it only once
+    omexml = get_OMEXML_from_reader(rdr)
+    with _timed('omexml.parse', len(omexml)):
+        omexmlroot = etl.fromstring(omexml)
+
     # get JavaMetaDataStore and SeriesCount
     try:
         jmd, MetaInfo['TotalSeries'], MetaInfo['ImageIDs'], MetaInfo['SeriesDimensions'],\
-            MetaInfo['MultiResolution'] = get_java_metadata_store(imagefile)
+            MetaInfo['MultiResolution'] = get_java_metadata_store(imagefile, rdr=rdr)
     except:
         print('Problem retrieving Java Metadata Store or Series size:', sys.exc_info()[0])
+        release_reader(rdr, usepool=usepool)
         raise
 
+    if MetaInfo['MultiResolution']:
+        MetaInfo['ResolutionCounts'] = get_resolution_counts(rdr)
+
+    release_reader(rdr, usepool=usepool)
+
     # get dimension information and MetaInfo
     try:
         MetaInfo = get_metainfo_dimension(jmd, MetaInfo, imageID=0)
     except:
         print('Problem retrieving image dimensions:', sys.exc_info()[0])
 
+    cziinfo = None
     if imagefile[-4:] == '.czi':
-        # get objective information using cziread
+        # get all CZI specific information using a single czifile pass
         print('Using czifile.py to get CZI Shape info.')
-        MetaInfo['ShapeCZI'], MetaInfo['OrderCZI'], MetaInfo['CZIhasPreview'] = czt.get_shapeinfo_cziread(imagefile)
+        cziinfo = czt.get_cziinfo(imagefile)
+        MetaInfo['ShapeCZI'] = cziinfo['Shape']
+        MetaInfo['OrderCZI'] = cziinfo['Order']
+        MetaInfo['CZIhasPreview'] = cziinfo['HasPreview']
         MetaInfo['NumScenes'] = get_metainfo_numscenes(MetaInfo['ShapeCZI'], MetaInfo['OrderCZI'])
 
     print('Using BioFormats to get MetaInformation.')
 
     # use bioformats to get the objective information
     try:
-        MetaInfo['Immersion'], MetaInfo['NA'], MetaInfo['ObjMag'], MetaInfo['ObjModel'] = get_metainfo_objective(jmd, imagefile, imageID=0)
+        MetaInfo['Immersion'], MetaInfo['NA'], MetaInfo['ObjMag'], MetaInfo['ObjModel'] = get_metainfo_objective(jmd, imagefile,
+                                                                                                                  imageID=0,
+                                                                                                                  cziinfo=cziinfo)
     except:
         print('Problem retrieving object information:', sys.exc_info()[0])
 
@@ -1005,11 +3149,11 @@ def get_relevant_metainfo_wrapper(imagefile,
     except:
         print('Problem retrieving wavelength information:', sys.exc_info()[0])
 
-    # get channel description
-    try:
-        MetaInfo['ChDesc'] = czt.get_metainfo_channel_description(imagefile)
-    except:
-        print('Problem retrieving channel description:', sys.exc_info()[0])
+    # get channel description - only available for CZI files
+    if cziinfo is not None:
+        MetaInfo['ChDesc'] = cziinfo['ChDesc']
+    else:
+        MetaInfo['ChDesc'] = 'n.a.'
 
     # summarize dimensions
     if xyorder == 'XY':
@@ -1022,21 +3166,23 @@ def get_relevant_metainfo_wrapper(imagefile,
                              MetaInfo['SizeC'], MetaInfo['SizeY'], MetaInfo['SizeX']]
 
     # try to get detector information - 1
+    detectors = getinfofromOMEXML(omexmlroot, ['Instrument', 'Detector'], namespace)
+
     try:
-        MetaInfo['Detector Model'] = getinfofromOMEXML(omexml, ['Instrument', 'Detector'], namespace)[0]['Model']
+        MetaInfo['Detector Model'] = detectors[0]['Model']
     except:
-        try:
-            MetaInfo['Detector Model'] = czt.get_metainfo_cziread_camera(imagefile)
-        except:
+        if cziinfo is not None and cziinfo['CameraName'] is not None:
+            MetaInfo['Detector Model'] = cziinfo['CameraName']
+        else:
             print('Problem reading Detector Model.')
             MetaInfo['Detector Model'] = 'n.a.'
 
     try:
-        MetaInfo['Detector Name'] = getinfofromOMEXML(omexml, ['Instrument', 'Detector'], namespace)[0]['ID']
+        MetaInfo['Detector Name'] = detectors[0]['ID']
     except:
-        try:
-            MetaInfo['Detector Name'] = czt.get_metainfo_cziread_detetcor(imagefile)
-        except:
+        if cziinfo is not None and cziinfo['DetectorName'] is not None:
+            MetaInfo['Detector Name'] = cziinfo['DetectorName']
+        else:
             print('Problem reading Detector Name.')
             MetaInfo['Detector Name'] = 'n.a.'
 
@@ -1054,6 +3200,9 @@ def get_relevant_metainfo_wrapper(imagefile,
         MetaInfo['Sizes'][0] = MetaInfo['Sizes'][0] - 1
         MetaInfo['TotalSeries'] = MetaInfo['TotalSeries'] - 1
 
+    if usecache:
+        METACACHE.put(imagefile, 'metainfo', MetaInfo, namespace=namespace, xyorder=xyorder)
+
     if showinfo:
         showtypicalmetadata(MetaInfo)
 
@@ -1082,6 +3231,9 @@ def calc_series_range_well(wellnumber, imgperwell):
 def writeomexml(imagefile, method=1, writeczi_metadata=True):
 
     # creates readable xml files from image data files. Default method should be = 1.
+    import czitools as czt
+    from lxml import etree as etl
+
     if method == 1:
         # method 1
         # Change File name and write XML file to same folder
@@ -1158,9 +3310,14 @@ def getinfofromOMEXML(omexml, nodenames, ns='http://www.openmicroscopy.org/Schem
     print result[1]
 
     """
+    from lxml import etree as etl
 
-    # get the root tree
-    root = etl.fromstring(omexml)
+    # get the root tree - an already parsed tree can be passed in as well
+    if etl.iselement(omexml):
+        root = omexml
+    else:
+        with _timed('omexml.parse', len(omexml)):
+            root = etl.fromstring(omexml)
 
     # define the namespace in order to find the correct path later on
     NSMAP = {'mw': ns}
@@ -1197,6 +3354,8 @@ def parseXML(omexml, topchild, subchild, highdetail=False):
     topchild = specific node to search for
     subchild = specfic subchild of the topchild to search for
     """
+    from lxml import etree as etl
+
     root = etl.fromstring(omexml)
     tree = etl.ElementTree(root)
 
@@ -1259,11 +3418,9 @@ def getWelllNamesfromCZI(imagefile, namespace='{http://www.openmicroscopy.org/Sc
     :param filename: input CZI image file location
     :return: string wellstring containing the information
     """
+    from lxml import etree as etl
 
-    if not VM_STARTED:
-        start_jvm()
-    if VM_KILLED:
-        jvm_error()
+    JVM.start()
 
     # Current key for wells inside the meta-information - 2016_07_21
     wellkey = 'Information|Image|S|Scene|Shape|Name'
@@ -1338,7 +3495,7 @@ def processWellStringfromCZI(wellstring):
         well_ch = wellid_split[0]
         well_id = wellid_split[1]
         # update the column index based on the number
-        cols.append(np.int(well_id) - 1)
+        cols.append(int(well_id) - 1)
         # update the row index based on the character
         rows.append(rowIDs.index(well_ch))
     # count the content of the list, e.g. how many time a certain well was detected
@@ -1373,6 +3530,8 @@ def getPlanesAndPixelsFromCZI(imagefile):
       Attention: works for CZI image data sets only!
       Added by Volker.Hilsenstein@embl.de
     """
+    from lxml import etree as etl
+
     # if not VM_STARTED:
     #    start_jvm()
     # if VM_KILLED:
@@ -1507,6 +3666,127 @@ def calc_series_pylevel(num_series,
     return series_ids
 
 
+def is_pylevel(dimensions, seriesID, pyramid, minfactor=1.5):
+    """
+    Check if the series is the next level of the pyramid. The series must be smaller than the
+    last level by at least minfactor, the downscaling factor relative to the full resolution
+    must be an integer and the aspect ratio must be the same as the full resolution.
+    """
+
+    fullx, fully = dimensions[pyramid[0]]
+    lastx, lasty = dimensions[pyramid[-1]]
+    dimx, dimy = dimensions[seriesID]
+
+    if dimx * minfactor > lastx or dimy * minfactor > lasty:
+        return False
+
+    # the sizes of the levels are rounded, so a difference of one pixel is allowed
+    factor = int(round(fullx / float(dimx)))
+    if factor < 2 or abs(fullx - dimx * factor) > factor or abs(fully - dimy * factor) > factor:
+        return False
+
+    return True
+
+
+def get_pyramid_series(MetaInfo):
+    """
+    Group the series into scenes and return a list with the series IDs of every scene,
+    ordered from fine to coarse. The attachment image of a CZI (preview) is not included.
+    The resolution counts of the reader are used, if available in MetaInfo['ResolutionCounts'].
+    Otherwise BioFormats lists the resolution levels of a scene one after another, starting
+    with the full resolution, and a series is added to the pyramid of the previous series,
+    when is_pylevel is true. Without MultiResolution every series is a scene of its own.
+    """
+
+    numseries = MetaInfo['TotalSeries'] or len(MetaInfo['SeriesDimensions'])
+    dimensions = MetaInfo['SeriesDimensions'][:numseries]
+
+    if not MetaInfo.get('MultiResolution'):
+        return [[seriesID] for seriesID in range(len(dimensions))]
+
+    scenes = []
+    counts = MetaInfo.get('ResolutionCounts')
+    if counts:
+        seriesID = 0
+        for count in counts:
+            if seriesID >= len(dimensions):
+                break
+            scenes.append(list(range(seriesID, min(seriesID + count, len(dimensions)))))
+            seriesID += count
+
+        return scenes
+
+    for seriesID in range(len(dimensions)):
+        if scenes and is_pylevel(dimensions, seriesID, scenes[-1]):
+            scenes[-1].append(seriesID)
+        else:
+            scenes.append([seriesID])
+
+    return scenes
+
+
+def get_pylevel_scaling(MetaInfo, seriesID, scene):
+    """
+    Return the pixel size (XScale, YScale) of a series, which is a level of the pyramid of scene.
+    The scaling of the full resolution level is multiplied by the downscaling factor of the level.
+    """
+
+    fullx, fully = MetaInfo['SeriesDimensions'][scene[0]]
+    dimx, dimy = MetaInfo['SeriesDimensions'][seriesID]
+
+    scalex = MetaInfo['XScale'] or 1.0
+    scaley = MetaInfo['YScale'] or scalex
+
+    return scalex * fullx / float(dimx), scaley * fully / float(dimy)
+
+
+def select_pylevel(MetaInfo, pixelsize=None, maxshape=None, scenes=None):
+    """
+    Select the pyramid level to read for every scene.
+
+    pixelsize - target pixel size in microns. The coarsest level with a pixel size
+                smaller or equal the target is selected.
+    maxshape  - maximum output shape (Y, X). If the selected level is larger,
+                the next coarser level fitting inside maxshape is selected.
+    scenes    - list of scenes - default is all scenes
+
+    If a constraint cannot be fulfilled, the closest level is used: the full resolution for
+    pixelsize and the coarsest level for maxshape. Without any constraint the coarsest level is used.
+    Returns a list with a tuple (scene, seriesID, pylevel, (sizeY, sizeX), (XScale, YScale)) for every scene.
+    """
+
+    pyramids = get_pyramid_series(MetaInfo)
+    if scenes is None:
+        scenes = range(len(pyramids))
+
+    selection = []
+    for sceneID in scenes:
+        pyramid = pyramids[sceneID]
+
+        if pixelsize is None and maxshape is None:
+            pylevel = len(pyramid) - 1
+        else:
+            pylevel = 0
+
+        if pixelsize is not None:
+            for level, seriesID in enumerate(pyramid):
+                if min(get_pylevel_scaling(MetaInfo, seriesID, pyramid)) <= pixelsize * (1 + 1e-6):
+                    pylevel = level
+
+        if maxshape is not None:
+            while pylevel < len(pyramid) - 1:
+                dimx, dimy = MetaInfo['SeriesDimensions'][pyramid[pylevel]]
+                if dimy <= maxshape[0] and dimx <= maxshape[1]:
+                    break
+                pylevel += 1
+
+        seriesID = pyramid[pylevel]
+        dimx, dimy = MetaInfo['SeriesDimensions'][seriesID]
+        selection.append((sceneID, seriesID, pylevel, (dimy, dimx), get_pylevel_scaling(MetaInfo, seriesID, pyramid)))
+
+    return selection
+
+
 def filterplanetable(planetable, ImageID=0, T=0, Z=0, CH=0):
 
     # TODO - Implement smart filtering without creating an itermediate table
@@ -1557,6 +3837,9 @@ def scatterplot(planetable, ImageID=0, T=0, Z=0, CH=0, size=35,
     :param showsurface: displays the surface as 3D plot
     :return: Plot and optional save figure as ...
     """
+    from mpl_toolkits.mplot3d import axes3d
+    from matplotlib import cm
+    import matplotlib.pyplot as plt
 
     ptf = filterplanetable(planetable, ImageID=0, T=0, Z=0, CH=0)
 
@@ -1,30 +1,345 @@
-# -*- coding: utf-8 -*-
-"""
-@author: Sebi
-
-File: convert_czi2tiff.py
-Date: 11.08.2017
-Version. 0.1
-"""
-
-import os
-from czifile import czi2tif
-import numpy as np
-print(np.__version__)
-print(np.__path__)
-
-rootdir = r'c:\Users\M1SRH\Documents\Testdata_Zeiss\Atomic\Trainingsdaten_Spine_Detection\CZI'
-extensions = ('.czi')
-#extensions = ('.czi', '.lsm')
-
-for subdir, dirs, files in os.walk(rootdir):
-    for file in files:
-        ext = os.path.splitext(file)[-1].lower()
-        if ext in extensions:
-            czi2process = os.path.join(subdir, file)
-            # Save processed image
-            tiff2save = os.path.splitext(czi2process)[0] + '.tiff'
-            print('Converting to TIFF --> ', tiff2save)
-            czi2tif(czi2process, tiffile=tiff2save, bigtiff=True, truncate=True)
-
-print('Done.')
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: convert_czi2tiff.py
+Date: 18.10.2026
+Version. 0.2
+
+Parallel and resumable batch conversion of image files into OME-TIFF or Zarr (OME-NGFF).
+
+Every file is converted by a worker process with its own JVM, reading the planes one after
+another, so the memory usage does not depend on the size of the files. Converted files are
+recorded in a manifest with the checksum and mtime of the source file, so a rerun only
+converts new or modified files.
+
+Usage:
+------
+
+python convert_czi2tiff.py /data/screen -o /data/screen_ometiff -w 16
+python convert_czi2tiff.py /data/screen -o /data/screen_zarr -f zarr -w 16 --levels auto
+"""
+
+from __future__ import print_function
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+MANIFEST = 'convert_manifest.json'
+
+# number of times a file is started again after its worker process died
+MAXATTEMPTS = 3
+
+
+def get_checksum(filename, blocksize=16 * 1024 ** 2):
+    """
+    Return the SHA-1 checksum of a file, which is read in blocks.
+    """
+
+    sha = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(blocksize), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+def find_files(sourcedir, extensions=('.czi',)):
+    """
+    Return all files with one of the extensions below sourcedir as sorted list of relative paths.
+    """
+
+    found = []
+    for subdir, dirs, files in os.walk(sourcedir):
+        for file in files:
+            if os.path.splitext(file)[-1].lower() in extensions:
+                found.append(os.path.relpath(os.path.join(subdir, file), sourcedir))
+
+    return sorted(found)
+
+
+def get_outputfile(relpath, outputdir, fmt):
+    # the output mirrors the directory tree of the source files
+    base = os.path.splitext(os.path.join(outputdir, relpath))[0]
+    if fmt == 'zarr':
+        return base + '.zarr'
+
+    return base + '.ome.tiff'
+
+
+def read_manifest(manifestfile):
+    """
+    Return the manifest as dictionary relpath -> entry or an empty dictionary.
+    """
+
+    try:
+        with open(manifestfile, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifestfile, manifest):
+    # write to a temporary file first, so a crash never leaves a broken manifest behind
+    tmpfile = manifestfile + '.tmp'
+    with open(tmpfile, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmpfile, manifestfile)
+
+
+def is_done(entry, sourcefile, outputfile, verify=False):
+    """
+    Check if the manifest entry matches the source file and the output exists.
+    With verify=True the checksum of the source file is compared as well. Entries
+    converted without verify have no checksum and are converted again.
+    """
+
+    if entry is None or not os.path.exists(outputfile):
+        return False
+
+    stat = os.stat(sourcefile)
+    if entry.get('mtime') != stat.st_mtime or entry.get('size') != stat.st_size:
+        return False
+
+    if verify and entry.get('checksum') != get_checksum(sourcefile):
+        return False
+
+    return True
+
+
+def remove_output(path):
+    # remove an old output file or Zarr directory
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def convert_file(sourcefile, outputfile, fmt='ometiff', bfpath=None, options=None, checksum=False, running=None):
+    """
+    Convert a single file. Runs inside a worker process, which starts its own JVM on first use.
+    The output is written under a temporary name and renamed when complete.
+    The checksum of the source file is only calculated with checksum=True, because it reads the file again.
+    running is a shared dictionary, where the file is registered when the conversion starts.
+    Returns a dictionary with the results for the manifest.
+    """
+    import bftools as bf
+
+    if running is not None:
+        running[sourcefile] = os.getpid()
+    if options is None:
+        options = {}
+    if bfpath is not None:
+        bf.set_bfpath(bfpath)
+
+    start = time.time()
+    stat = os.stat(sourcefile)
+
+    outputdir = os.path.dirname(outputfile)
+    if outputdir and not os.path.isdir(outputdir):
+        os.makedirs(outputdir, exist_ok=True)
+
+    partfile = outputfile + '.part'
+    remove_output(partfile)
+
+    MetaInfo = bf.get_relevant_metainfo_wrapper(sourcefile)
+
+    if fmt == 'zarr':
+        import zarrtools as zt
+        zt.convert_to_zarr(sourcefile, partfile,
+                           chunks=options.get('chunks', zt.CHUNKS),
+                           levels=options.get('levels', 0),
+                           num_workers=options.get('threads', 4),
+                           MetaInfo=MetaInfo,
+                           overwrite=True)
+    else:
+        with bf.OMETIFFWriter(partfile,
+                              scalex=MetaInfo['XScale'],
+                              scaley=MetaInfo['YScale'],
+                              scalez=MetaInfo['ZScale'],
+                              tile=options.get('tile'),
+                              compression=options.get('compression'),
+                              maxworkers=options.get('threads'),
+                              subresolutions=options.get('levels', 0),
+                              channelnames=MetaInfo['Channels'],
+                              name=os.path.basename(outputfile)) as writer:
+            writer.write_planes(bf.iterate_planes(sourcefile))
+
+    remove_output(outputfile)
+    os.replace(partfile, outputfile)
+
+    # the pooled reader keeps the file open - close it, the next file is a different one
+    bf.close_readers(sourcefile)
+
+    return {'output': outputfile,
+            'checksum': get_checksum(sourcefile) if checksum else None,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'seconds': time.time() - start,
+            'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def convert_tree(sourcedir, outputdir, fmt='ometiff', num_workers=4, extensions=('.czi',),
+                 manifestfile=None, bfpath=None, options=None, verify=False, maxattempts=MAXATTEMPTS):
+    """
+    Convert all files below sourcedir with a pool of num_workers processes. Files already
+    listed in the manifest with the same mtime and size are skipped. The manifest is
+    updated after every converted file, so an interrupted run can just be started again.
+    If a worker process dies, the pool is started again and the files running at that
+    time are tried up to maxattempts times. All other files are not affected.
+    With verify=True the checksums of the source files are stored in the manifest.
+    """
+
+    if manifestfile is None:
+        manifestfile = os.path.join(outputdir, MANIFEST)
+    if not os.path.isdir(outputdir):
+        os.makedirs(outputdir)
+
+    manifest = read_manifest(manifestfile)
+
+    todo = []
+    for relpath in find_files(sourcedir, extensions):
+        sourcefile = os.path.join(sourcedir, relpath)
+        outputfile = get_outputfile(relpath, outputdir, fmt)
+        if is_done(manifest.get(relpath), sourcefile, outputfile, verify=verify):
+            continue
+        todo.append((relpath, sourcefile, outputfile))
+
+    print('Files to convert : ', len(todo), ' - already converted : ', len(manifest))
+
+    totalbytes = sum(os.path.getsize(sourcefile) for relpath, sourcefile, outputfile in todo)
+    donebytes = 0
+    converted = 0
+    total = len(todo)
+    failed = []
+    attempts = {}
+    start = time.time()
+
+    # spawn instead of fork, because a forked JVM is not usable
+    context = mp.get_context('spawn')
+    with context.Manager() as manager:
+        running = manager.dict()
+
+        while todo:
+            running.clear()
+            unfinished = list(todo)
+            broken = False
+
+            with ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as executor:
+                futures = {executor.submit(convert_file, sourcefile, outputfile, fmt, bfpath, options,
+                                           verify, running): (relpath, sourcefile, outputfile)
+                           for relpath, sourcefile, outputfile in todo}
+
+                for future in as_completed(futures):
+                    item = futures[future]
+                    relpath = item[0]
+                    try:
+                        entry = future.result()
+                    except BrokenProcessPool:
+                        # a worker died (segfault of the JVM, out of memory) - the file is tried again below
+                        broken = True
+                        continue
+                    except Exception as error:
+                        print('FAILED  ', relpath, ':', repr(error))
+                        failed.append((relpath, repr(error)))
+                        unfinished.remove(item)
+                        continue
+
+                    unfinished.remove(item)
+                    manifest[relpath] = entry
+                    write_manifest(manifestfile, manifest)
+
+                    converted += 1
+                    donebytes += entry['size']
+                    elapsed = time.time() - start
+                    rate = donebytes / 1024.0 ** 2 / elapsed if elapsed > 0 else 0.0
+                    remaining = (totalbytes - donebytes) / 1024.0 ** 2 / rate if rate > 0 else 0.0
+
+                    print('[%d/%d] %s  %.1f s  -  %.1f MB/s  -  ETA %.0f min' % (converted, total, relpath,
+                                                                              entry['seconds'], rate, remaining / 60.0))
+
+            if not broken:
+                break
+
+            # only the files running when the pool broke count as attempt, the others are just submitted again
+            suspects = [item for item in unfinished if item[1] in running]
+            if not suspects:
+                suspects = unfinished
+
+            todo = []
+            for item in unfinished:
+                relpath, sourcefile, outputfile = item
+                if item in suspects:
+                    attempts[relpath] = attempts.get(relpath, 0) + 1
+                    if attempts[relpath] >= maxattempts:
+                        print('FAILED  ', relpath, ': worker process died', attempts[relpath], 'times')
+                        failed.append((relpath, 'worker process died'))
+                        remove_output(outputfile + '.part')
+                        continue
+                todo.append(item)
+
+            if todo:
+                print('A worker process died. Restarting the pool for', len(todo), 'files.')
+
+    elapsed = time.time() - start
+    report = {'converted': converted,
+              'failed': failed,
+              'seconds': elapsed,
+              'MB': donebytes / 1024.0 ** 2,
+              'MB_per_s': donebytes / 1024.0 ** 2 / elapsed if elapsed > 0 else None,
+              'files_per_h': converted / elapsed * 3600 if elapsed > 0 else None}
+
+    return report
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Convert image files into OME-TIFF or Zarr in parallel.')
+    parser.add_argument('sourcedir', help='directory with the files to convert - subdirectories are included')
+    parser.add_argument('-o', '--outputdir', default=None, help='output directory, default is the source directory')
+    parser.add_argument('-f', '--format', default='ometiff', choices=['ometiff', 'zarr'], help='output format')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='number of worker processes')
+    parser.add_argument('-t', '--threads', type=int, default=None, help='threads per worker for compression')
+    parser.add_argument('-e', '--extensions', nargs='+', default=['.czi'], help='file extensions to convert')
+    parser.add_argument('-m', '--manifest', default=None, help='manifest file, default is ' + MANIFEST + ' in the output directory')
+    parser.add_argument('-b', '--bfpath', default=None, help='path to bioformats_package.jar')
+    parser.add_argument('--compression', default=None, help='compression for OME-TIFF, e.g. zlib, lzw or zstd')
+    parser.add_argument('--tile', type=int, nargs=2, default=None, help='tile size for OME-TIFF')
+    parser.add_argument('--chunks', type=int, nargs=3, default=None, help='chunk shape Z Y X for Zarr')
+    parser.add_argument('--levels', default='0', help='number of pyramid levels or auto')
+    parser.add_argument('--verify', action='store_true', help='store and compare checksums of the source files')
+    parser.add_argument('--attempts', type=int, default=MAXATTEMPTS, help='attempts per file if a worker process dies')
+    args = parser.parse_args()
+
+    options = {'levels': args.levels if args.levels == 'auto' else int(args.levels),
+               'compression': args.compression,
+               'tile': args.tile}
+    if args.threads is not None:
+        options['threads'] = args.threads
+    if args.chunks is not None:
+        options['chunks'] = tuple(args.chunks)
+
+    report = convert_tree(args.sourcedir, args.outputdir or args.sourcedir,
+                          fmt=args.format,
+                          num_workers=args.workers,
+                          extensions=tuple(e.lower() for e in args.extensions),
+                          manifestfile=args.manifest,
+                          bfpath=args.bfpath,
+                          options=options,
+                          verify=args.verify,
+                          maxattempts=args.attempts)
+
+    print('Converted        : ', report['converted'], 'files in', round(report['seconds'], 1), 's')
+    print('Throughput       : ', round(report['MB_per_s'] or 0, 1), 'MB/s  -', round(report['files_per_h'] or 0, 1), 'files/h')
+    if report['failed']:
+        print('Failed           : ', len(report['failed']))
+        sys.exit(1)
+
+    print('Done.')
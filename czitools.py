@@ -11,6 +11,7 @@ import misctools as misc
 import czifile as zis
 import numpy as np
 import re
+import sys
 from collections import Counter
 import xml.etree.ElementTree as ET
 
@@ -23,7 +24,7 @@ def get_metainfo_channel_description(filename):
         valuelst = []
         # get root tree of CZI metadata (uses ElementTree)
 
-        for elem in czi.metadata.getiterator():
+        for elem in get_metadata_root(czi).iter():
 
             namelst.append(elem.tag)
             valuelst.append(elem.text)
@@ -61,7 +62,7 @@ def get_objective_name_cziread(filename):
     valuelst = []
     # get root tree of CZI metadata (uses ElementTree)
 
-    for elem in czi.metadata.getiterator():
+    for elem in get_metadata_root(czi).iter():
 
         namelst.append(elem.tag)
         valuelst.append(elem.text)
@@ -134,24 +135,95 @@ def get_shapeinfo_cziread(filename):
     return czishape, cziorder, has_attimage
 
 
+def get_metadata_root(czi):
+    # return the CZI metadata as ElementTree element for old and new versions of czifile.py
+
+    md = czi.metadata
+    if callable(md):
+        md = md()
+    if isinstance(md, (str, bytes)):
+        md = ET.fromstring(md)
+
+    return md
+
+
+def get_cziinfo(filename):
+    """
+    Collect all CZI specific information required by bftools.get_relevant_metainfo_wrapper
+    by opening the CZI file only once and iterating over the metadata only once.
+    """
+
+    cziinfo = {'Shape': 'unknown',
+               'Order': 'unknown',
+               'HasPreview': None,
+               'ChDesc': 'n.a.',
+               'ObjectiveName': None,
+               'CameraName': None,
+               'DetectorName': None}
+
+    try:
+        czi = zis.CziFile(filename)
+    except:
+        print('czifile.py did not detect an CZI file.')
+        return cziinfo
+
+    cziinfo['Shape'] = czi.shape
+    cziinfo['Order'] = czi.axes
+
+    try:
+        cziinfo['HasPreview'] = check_for_previewimage(czi)
+    except:
+        print('Could not check for attachments in CZI file.')
+
+    try:
+        chdescript = []
+        objnames = []
+
+        for elem in get_metadata_root(czi).iter():
+
+            if elem.tag == 'Description':
+                chdescript.append(elem.text)
+
+            if elem.tag == 'ObjectiveName':
+                objnames.append(elem.text)
+
+            if elem.tag == 'CameraName':
+                cziinfo['CameraName'] = elem.text
+
+            if elem.tag == 'Detector':
+                cziinfo['DetectorName'] = elem.get('Name', elem.text)
+
+        cziinfo['ChDesc'] = chdescript
+        # the objective name is a single string like the one from the OME-XML
+        if objnames:
+            cziinfo['ObjectiveName'] = objnames[0]
+
+    except:
+        print('Could not read the CZI metadata.')
+
+    czi.close()
+
+    return cziinfo
+
+
 def get_metainfo_cziread(filename):
 
     # define default values in case something is missing inside the metadata
-    objNA = np.NaN
-    objMag = np.NaN
+    objNA = np.nan
+    objMag = np.nan
     objName = 'n.a.'
     objImm = 'n.a.'
     CamName = 'n.a.'
-    totalMag = np.NaN
+    totalMag = np.nan
 
     try:
         czi = zis.CziFile(filename)
 
         # Iterate over the metadata
-        for elem in czi.metadata.getiterator():
+        for elem in get_metadata_root(czi).iter():
 
             if elem.tag == 'LensNA':
-                objNA = np.float(elem.text)
+                objNA = float(elem.text)
 
             if elem.tag == 'NominalMagnification':
                 objMag = elem.text
@@ -166,7 +238,7 @@ def get_metainfo_cziread(filename):
                 CamName = elem.text
 
             if elem.tag == 'TotalMagnification':
-                totalMag = np.float(elem.text)
+                totalMag = float(elem.text)
                 if totalMag == 0:
                     totalMag == 'n.a.'
 
@@ -238,7 +310,7 @@ def getWellInfofromCZI(wellstring):
         wellid_split = re.findall('\d+|\D+', welllist[i])
         well_ch = wellid_split[0]
         well_id = wellid_split[1]
-        cols.append(np.int(well_id) - 1)
+        cols.append(int(well_id) - 1)
         well_id_index = rowIDs.index(well_ch)
         rows.append(well_id_index)
 
@@ -293,3 +365,123 @@ def check_for_previewimage(czi):
         has_attimage = True
 
     return has_attimage
+
+
+def read_image6d_czifile(filename, scenes=None, tindices=None, zindices=None, cindices=None,
+                         xywh=None, allocate=None, series=None):
+    """
+    Read the pixel data of a CZI file directly using czifile.py without BioFormats and the JVM.
+
+    The output has the same layout as bftools.get_image6d: [Scenes, T, Z, C, Y, X]. The index
+    lists select the scenes, timepoints, z-planes and channels to read (default is all of them)
+    and only the subblocks required for those are decoded. XY positions are relative to the
+    origin of every scene, like the image series created by BioFormats. With xywh = (x, y, width, height)
+    only this region is returned. allocate(shape, dtype) can be used to create the output array.
+
+    The tiles of mosaic images (M) are placed by their XY start, so every scene is returned as one image.
+
+    scenes are the indices of the CZI scenes. For pyramidal CZI files BioFormats creates one series
+    per pyramid level, so its series IDs are not the same as the scenes. BioFormats series IDs
+    can be passed using series instead of scenes. They are only accepted for files without pyramid.
+
+    Only the full resolution subblocks are used. A NotImplementedError is raised for data czifile.py
+    cannot decode (unsupported compression, RGB pixel types or additional dimensions), so the caller
+    can fall back to BioFormats.
+    """
+
+    czi = zis.CziFile(filename)
+
+    try:
+        dtype = np.dtype(czi.dtype)
+        if dtype.shape:
+            raise NotImplementedError('RGB pixel types are not supported by the czifile reader.')
+
+        czishape = dict(zip(czi.axes, czi.shape))
+        for axis, size in czishape.items():
+            if axis not in 'STZCMYX0' and size > 1:
+                raise NotImplementedError('Dimension ' + axis + ' is not supported by the czifile reader.')
+
+        # use only full resolution subblocks - pyramid subblocks are stored downscaled
+        entries = [e for e in czi.filtered_subblock_directory if e.stored_shape == e.shape]
+
+        if series is not None:
+            if len(entries) < len(czi.filtered_subblock_directory):
+                raise NotImplementedError('The BioFormats series of pyramidal CZI files are not the scenes.')
+            scenes = series
+
+        # the origin of every scene, so the XY positions match the BioFormats series
+        origins = {}
+        extents = {}
+        for entry in entries:
+            start = dict(zip(entry.axes, entry.start))
+            size = dict(zip(entry.axes, entry.shape))
+            scene = start.get('S', 0)
+            y0, x0 = origins.get(scene, (start['Y'], start['X']))
+            y1, x1 = extents.get(scene, (start['Y'] + size['Y'], start['X'] + size['X']))
+            origins[scene] = (min(y0, start['Y']), min(x0, start['X']))
+            extents[scene] = (max(y1, start['Y'] + size['Y']), max(x1, start['X'] + size['X']))
+
+        scenestart = min(origins.keys())
+        sizeY = max(extents[sc][0] - origins[sc][0] for sc in origins)
+        sizeX = max(extents[sc][1] - origins[sc][1] for sc in origins)
+
+        # the remaining dimensions start with an offset in some files
+        czistart = dict(zip(czi.axes, czi.start))
+
+        selections = []
+        for axis, indices in zip('STZC', [scenes, tindices, zindices, cindices]):
+            if indices is None:
+                indices = range(czishape.get(axis, 1))
+            selections.append(dict((idx, pos) for pos, idx in enumerate(indices)))
+
+        if xywh is None:
+            xywh = (0, 0, sizeX, sizeY)
+        rx, ry, rw, rh = xywh
+
+        shape = [len(sel) for sel in selections] + [rh, rw]
+        if allocate is None:
+            out = np.zeros(shape, dtype=dtype)
+        else:
+            out = allocate(shape, dtype)
+
+        for entry in entries:
+            start = dict(zip(entry.axes, entry.start))
+            size = dict(zip(entry.axes, entry.shape))
+
+            index = []
+            for axis, sel in zip('STZC', selections):
+                if size.get(axis, 1) > 1:
+                    raise NotImplementedError('Subblocks spanning several ' + axis + ' indices are not supported.')
+                if axis == 'S':
+                    idx = start.get('S', scenestart) - scenestart
+                else:
+                    idx = start.get(axis, czistart.get(axis, 0)) - czistart.get(axis, 0)
+                if idx not in sel:
+                    break
+                index.append(sel[idx])
+
+            # the subblock is not part of the selection
+            if len(index) < 4:
+                continue
+
+            # tile position relative to the scene origin and the requested region
+            oy, ox = origins[start.get('S', 0)]
+            ty = start['Y'] - oy - ry
+            tx = start['X'] - ox - rx
+            y0, y1 = max(ty, 0), min(ty + size['Y'], rh)
+            x0, x1 = max(tx, 0), min(tx + size['X'], rw)
+            if y0 >= y1 or x0 >= x1:
+                continue
+
+            try:
+                tile = entry.data_segment().data(resize=True)
+            except (KeyError, ImportError, ValueError):
+                # unknown compression or missing codec
+                raise NotImplementedError('czifile.py can not decode the subblock: ' + str(sys.exc_info()[1]))
+            tile = tile.reshape(size['Y'], size['X'])
+            out[index[0], index[1], index[2], index[3], y0:y1, x0:x1] = tile[y0 - ty:y1 - ty, x0 - tx:x1 - tx]
+
+    finally:
+        czi.close()
+
+    return out
@@ -37,9 +37,9 @@ def writeOMETIFF(img_XYCZT, path, type='uint16', verbose=True):
     p.SizeC = SizeC
     p.SizeT = SizeT
     p.SizeZ = SizeZ
-    p.PhysicalSizeX = np.float(0.1)
-    p.PhysicalSizeY = np.float(0.1)
-    p.PhysicalSizeZ = np.float(0.5)
+    p.PhysicalSizeX = float(0.1)
+    p.PhysicalSizeY = float(0.1)
+    p.PhysicalSizeZ = float(0.5)
     p.DimensionOrder = ome.DO_XYCZT
     p.PixelType = type
     p.channel_count = SizeC
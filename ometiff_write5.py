@@ -60,9 +60,9 @@ p.SizeY = SizeY
 p.SizeC = SizeC
 p.SizeT = SizeT
 p.SizeZ = SizeZ
-p.PhysicalSizeX = np.float(scalex)
-p.PhysicalSizeY = np.float(scaley)
-p.PhysicalSizeZ = np.float(scalez)
+p.PhysicalSizeX = float(scalex)
+p.PhysicalSizeY = float(scaley)
+p.PhysicalSizeZ = float(scalez)
 p.PixelType = pixeltype
 p.channel_count = SizeC
 p.plane_count = SizeZ * SizeT * SizeC
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_bfasync.py
+Date: 18.10.2026
+Version. 0.1
+"""
+
+import bftools as bf
+import bfasync
+import asyncio
+import time
+
+filename = r'testdata/Beads_63X_NA1.35_xy=0.042_z=0.1.czi'
+
+# specify bioformats_package.jar to use if required
+bfpackage = r'bfpackage/5.9.2/bioformats_package.jar'
+bf.set_bfpath(bfpackage)
+
+# use 4 threads attached to the JVM and allow 8 requests at once
+bfasync.set_async_limits(max_workers=4, max_requests=8)
+
+
+async def main():
+
+    MetaInfo = await bfasync.get_relevant_metainfo_wrapper_async(filename)
+    print('Sizes [STZCYX] : ', MetaInfo['Sizes'])
+
+    # several previews are read concurrently
+    start = time.time()
+    planes = await asyncio.gather(*[bfasync.get_image2d_async(filename, 0, 0, z, 0)
+                                    for z in range(MetaInfo['SizeZ'])])
+    print('Planes read    : ', len(planes), 'in', round(time.time() - start, 3), 's')
+
+    # the z-stack read can be cancelled as long as it waits for the executor
+    task = asyncio.ensure_future(bfasync.get_zstack_async(filename, MetaInfo['Sizes'], 0))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        print('Z-Stack read was cancelled.')
+
+    planetable, csvfile, MetaInfo = await bfasync.get_planetable_async(filename)
+    print(planetable.head())
+
+
+asyncio.run(main())
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_czifile_mosaic.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks that czitools.read_image6d_czifile places the tiles of a mosaic (M) CZI by their
+XY start. czifile.py cannot write CZI files, so the subblock directory of a tiled scan
+with two scenes is created in memory. Can be run directly or with pytest.
+"""
+
+import numpy as np
+import czitools as czt
+
+
+class SubBlock(object):
+
+    def __init__(self, data, s, c, m, y, x):
+        self.axes = 'SCMYX0'
+        self.start = (s, c, m, y, x, 0)
+        self.shape = (1, 1, 1) + data.shape + (1,)
+        self.stored_shape = self.shape
+        self._data = data
+
+    def data_segment(self):
+        return self
+
+    def data(self, resize=True):
+        return self._data[..., np.newaxis]
+
+
+class MosaicCziFile(object):
+
+    def __init__(self, subblocks, dtype):
+        self.filtered_subblock_directory = subblocks
+        self.dtype = dtype
+        self.axes = 'SCMYX0'
+        self.start = (0, 0, 0, 0, 0, 0)
+        numtiles = max(sb.start[2] for sb in subblocks) + 1
+        self.shape = (2, 2, numtiles, 0, 0, 1)
+
+    def close(self):
+        pass
+
+
+def create_mosaic(tile=(30, 40)):
+    """
+    Return the subblocks of 2 scenes with 2 channels and 2 x 2 tiles each and the expected images.
+    The scenes are at different stage positions, so the tiles start at an offset.
+    """
+
+    rng = np.random.RandomState(42)
+    expected = rng.randint(0, 4096, size=(2, 2, 2 * tile[0], 2 * tile[1])).astype(np.uint16)
+    offsets = [(1000, 500), (5000, 2000)]
+
+    subblocks = []
+    for s in range(2):
+        for c in range(2):
+            for m, (ty, tx) in enumerate([(0, 0), (0, 1), (1, 0), (1, 1)]):
+                y, x = ty * tile[0], tx * tile[1]
+                data = expected[s, c, y:y + tile[0], x:x + tile[1]]
+                subblocks.append(SubBlock(data, s, c, m, offsets[s][0] + y, offsets[s][1] + x))
+
+    return subblocks, expected
+
+
+def test_mosaic():
+    subblocks, expected = create_mosaic()
+
+    original = czt.zis.CziFile
+    czt.zis.CziFile = lambda filename: MosaicCziFile(subblocks, np.uint16)
+    try:
+        img6d = czt.read_image6d_czifile('mosaic.czi')
+        region = czt.read_image6d_czifile('mosaic.czi', scenes=[1], cindices=[1], xywh=(25, 10, 30, 40))
+        series = czt.read_image6d_czifile('mosaic.czi', series=[1], cindices=[0])
+    finally:
+        czt.zis.CziFile = original
+
+    assert img6d.shape == (2, 1, 1, 2, 60, 80)
+    assert np.array_equal(img6d[:, 0, 0], expected)
+    assert np.array_equal(region[0, 0, 0, 0], expected[1, 1, 10:50, 25:55])
+    assert np.array_equal(series[0, 0, 0, 0], expected[1, 0])
+
+
+if __name__ == '__main__':
+
+    test_mosaic()
+    print('Done.')
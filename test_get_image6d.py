@@ -116,6 +116,4 @@ if writeimage:
     fp = bf.write_ometiff(omefile, img6d,
                           scalex=MetaInfo['XScale'],
                           scaley=MetaInfo['YScale'],
-                          scalez=MetaInfo['ZScale'],
-                          dimorder='STZCXY',
-                          pixeltype='uint16')
+                          scalez=MetaInfo['ZScale'])
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+File: test_get_image6d_lazy.py
+Date: 18.10.2026
+Version. 0.1
+"""
+import numpy as np
+import bftools as bf
+from matplotlib import pyplot as plt, cm
+import dispvalues as dsv
+
+filename = r'testdata/Beads_63X_NA1.35_xy=0.042_z=0.1.czi'
+
+# use for BioFormtas > 5.2.0
+urlnamespace = 'http://www.openmicroscopy.org/Schemas/OME/2016-06'
+
+# specify bioformats_package.jar to use if required
+bfpackage = r'bfpackage/5.9.2/bioformats_package.jar'
+bf.set_bfpath(bfpackage)
+
+# get image meta-information using bioformats
+MetaInfo = bf.get_relevant_metainfo_wrapper(filename,
+                                            namespace=urlnamespace,
+                                            bfpath=bfpackage,
+                                            showinfo=False,
+                                            xyorder='YX')
+
+# nothing is read here - the planes are read when slicing the array
+img6d, readstate = bf.get_image6d(filename, MetaInfo,
+                                  num_levels=MetaInfo['PyLevels'],
+                                  num_scenes=MetaInfo['NumScenes'],
+                                  pylevel2read=0,
+                                  lazy=True)
+
+print('Lazy Array           : ', img6d)
+print('Array Shape          : ', img6d.shape)
+print('Array Type           : ', img6d.dtype)
+
+# read only the first channel of the first series
+zstack = img6d[0, 0, :, 0, :, :]
+print('Z-Stack Shape        : ', zstack.shape)
+
+# get plane with the brightest pixel
+zplane = (zstack == zstack.max()).nonzero()[0][0]
+print('Brightest Z-Plane    : ', zplane + 1)
+
+img2show = zstack[zplane, :, :]
+fig = plt.figure(figsize=(8, 8), dpi=100)
+ax = fig.add_subplot(111)
+cax = ax.imshow(img2show, interpolation='nearest', cmap=cm.hot)
+ax.set_title('S=1 T=1 Z=' + str(zplane + 1) + ' CH=1', fontsize=12)
+ax.set_xlabel('X-dimension [pixel]', fontsize=10)
+ax.set_ylabel('Y-dimension [pixel]', fontsize=10)
+cbar = fig.colorbar(cax)
+ax.format_coord = dsv.Formatter(cax)
+plt.show()
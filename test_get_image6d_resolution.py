@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_get_image6d_resolution.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks the pyramid level which get_image6d_resolution reads for a given maxshape or
+pixelsize. The level is chosen by select_pylevel, so a synthetic MetaInfo of a slide scan
+with three scenes is used instead of an image file and the JVM.
+Can be run directly or with pytest.
+"""
+
+import numpy as np
+import bftools as bf
+
+
+def create_metainfo():
+    # three scenes with a pyramid of factor 4 and a full resolution pixel size of 0.25 micron
+    dimensions = [(16000, 12000), (4000, 3000), (1000, 750), (250, 187),
+                  (8000, 8000), (2000, 2000), (500, 500),
+                  (4000, 2000), (1000, 500)]
+
+    return {'TotalSeries': len(dimensions),
+            'SeriesDimensions': dimensions,
+            'MultiResolution': True,
+            'ResolutionCounts': [4, 3, 2],
+            'XScale': 0.25,
+            'YScale': 0.25}
+
+
+def test_maxshape():
+    MetaInfo = create_metainfo()
+
+    # the finest level fitting into 1024 x 1024 for every scene
+    selection = bf.select_pylevel(MetaInfo, maxshape=(1024, 1024))
+    assert [(s[0], s[1], s[2], s[3]) for s in selection] == [(0, 2, 2, (750, 1000)),
+                                                            (1, 6, 2, (500, 500)),
+                                                            (2, 8, 1, (500, 1000))]
+    assert np.allclose(selection[0][4], (4.0, 4.0))
+
+    # nothing fits, so the coarsest level is used
+    selection = bf.select_pylevel(MetaInfo, maxshape=(100, 100), scenes=[0])
+    assert [(s[1], s[2]) for s in selection] == [(3, 3)]
+
+
+def test_pixelsize():
+    MetaInfo = create_metainfo()
+
+    # the coarsest level with a pixel size of at most 2 micron - 0.25, 1.0, 4.0 ...
+    selection = bf.select_pylevel(MetaInfo, pixelsize=2.0)
+    assert [(s[1], s[2]) for s in selection] == [(1, 1), (5, 1), (8, 1)]
+    assert np.allclose(selection[0][4], (1.0, 1.0))
+
+    # finer than the full resolution, so the full resolution is used
+    selection = bf.select_pylevel(MetaInfo, pixelsize=0.1, scenes=[2])
+    assert [(s[0], s[1], s[2]) for s in selection] == [(2, 7, 0)]
+
+
+def test_pixelsize_and_maxshape():
+    MetaInfo = create_metainfo()
+
+    # the pixel size selects the full resolution, which is too large for maxshape
+    selection = bf.select_pylevel(MetaInfo, pixelsize=0.25, maxshape=(3000, 4000))
+    assert [(s[1], s[2]) for s in selection] == [(1, 1), (5, 1), (7, 0)]
+
+
+if __name__ == '__main__':
+
+    test_maxshape()
+    test_pixelsize()
+    test_pixelsize_and_maxshape()
+    print('Done.')
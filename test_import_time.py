@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_import_time.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks that importing bftools does not load the plotting and table libraries and stays
+within the import-time budget. Can be run directly or with pytest.
+"""
+
+import subprocess
+import sys
+import os
+
+# maximum time in seconds for importing bftools, not counting javabridge and bioformats
+IMPORT_BUDGET = 0.35
+
+# modules which must only be imported by the functions using them
+LAZY_MODULES = ['matplotlib', 'mpl_toolkits', 'pandas', 'tifffile', 'lxml', 'czitools', 'czifile']
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_python(code, *options):
+    # run the code in a fresh interpreter, so no module is imported already
+    return subprocess.run([sys.executable] + list(options) + ['-c', code],
+                          cwd=HERE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+
+
+def get_import_time():
+    """
+    Import bftools with -X importtime and return the cumulative import time in seconds
+    minus the time spent importing javabridge and bioformats.
+    """
+
+    result = run_python('import bftools', '-X', 'importtime')
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        selftime, cumtime, name = line[len('import time:'):].split('|')
+        # keep the outermost entry of every module
+        cumulative[name.strip()] = int(cumtime)
+
+    javatime = cumulative.get('javabridge', 0) + cumulative.get('bioformats', 0)
+
+    return (cumulative['bftools'] - javatime) / 1e6
+
+
+def test_lazy_modules():
+
+    code = 'import sys, bftools; print(" ".join(m for m in %r if m in sys.modules))' % (LAZY_MODULES,)
+    loaded = run_python(code).stdout.split()
+
+    assert not loaded, 'Importing bftools loaded ' + ', '.join(loaded)
+
+
+def test_import_budget():
+
+    # take the best of three runs to ignore a cold file system cache
+    importtime = min(get_import_time() for i in range(3))
+
+    assert importtime < IMPORT_BUDGET, 'Importing bftools took ' + str(round(importtime, 3)) + ' s'
+
+
+if __name__ == '__main__':
+
+    print('Import time bftools [s] : ', round(min(get_import_time() for i in range(3)), 3))
+    print('Budget [s]              : ', IMPORT_BUDGET)
+    test_lazy_modules()
+    test_import_budget()
+    print('OK')
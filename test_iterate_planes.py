@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_iterate_planes.py
+Date: 18.10.2026
+Version. 0.1
+"""
+
+from __future__ import print_function
+import bftools as bf
+import numpy as np
+import time
+
+filename = r'testdata/Beads_63X_NA1.35_xy=0.042_z=0.1.czi'
+
+# specify bioformats_package.jar to use if required
+bfpackage = r'bfpackage/5.9.2/bioformats_package.jar'
+bf.set_bfpath(bfpackage)
+
+start = time.time()
+maxvalues = []
+
+# the next planes are decoded in the background while the current plane is processed
+for seriesID, timepoint, zplane, channel, plane in bf.iterate_planes(filename, prefetch=8):
+    maxvalues.append((seriesID, timepoint, zplane, channel, plane.max()))
+
+print('Planes read          : ', len(maxvalues))
+print('Time [s]             : ', np.round(time.time() - start, 3))
+
+# get plane with the brightest pixel
+brightest = max(maxvalues, key=lambda m: m[4])
+print('Brightest Plane STZC : ', brightest[:4])
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_ometiff_writer.py
+Date: 18.10.2026
+Version. 0.1
+"""
+
+from __future__ import print_function
+import bftools as bf
+import numpy as np
+import time
+
+filename = r'testdata/T=5_Z=3_CH=2_CZT_All_CH_per_Slice.czi'
+outputfile = filename[:-4] + '_streamed.ome.tiff'
+
+# specify bioformats_package.jar to use if required
+bfpackage = r'bfpackage/5.9.2/bioformats_package.jar'
+bf.set_bfpath(bfpackage)
+
+MetaInfo = bf.get_relevant_metainfo_wrapper(filename)
+
+start = time.time()
+
+# only the plane currently written is kept in memory
+with bf.OMETIFFWriter(outputfile,
+                      scalex=MetaInfo['XScale'],
+                      scaley=MetaInfo['YScale'],
+                      scalez=MetaInfo['ZScale']) as writer:
+    writer.write_planes(bf.iterate_planes(filename, prefetch=8))
+
+print('Planes written : ', len(writer.planes))
+print('Time [s]       : ', np.round(time.time() - start, 3))
+print('Output         : ', outputfile)
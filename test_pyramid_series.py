@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_pyramid_series.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks the grouping of series into scenes and pyramid levels and the level selection
+using synthetic MetaInfo dictionaries, so no image file is needed.
+Can be run directly or with pytest.
+"""
+
+import bftools as bf
+
+
+def create_metainfo(dimensions, multires=True, counts=None, scale=0.5):
+    return {'TotalSeries': len(dimensions),
+            'SeriesDimensions': dimensions,
+            'MultiResolution': multires,
+            'ResolutionCounts': counts,
+            'XScale': scale,
+            'YScale': scale}
+
+
+def test_single_resolution_scenes():
+    # scenes of different sizes without pyramid
+    MetaInfo = create_metainfo([(3000, 2000), (1000, 800)], multires=False)
+    assert bf.get_pyramid_series(MetaInfo) == [[0], [1]]
+
+    selection = bf.select_pylevel(MetaInfo, pixelsize=1.0)
+    assert [s[1] for s in selection] == [0, 1]
+
+
+def test_pyramids_with_different_aspect_ratio():
+    MetaInfo = create_metainfo([(4096, 4096), (2048, 2048), (1024, 1024), (600, 300), (300, 150)])
+    assert bf.get_pyramid_series(MetaInfo) == [[0, 1, 2], [3, 4]]
+
+
+def test_pyramids_with_rounded_sizes():
+    MetaInfo = create_metainfo([(4001, 3001), (2000, 1500), (1000, 750), (801, 601), (400, 300)])
+    assert bf.get_pyramid_series(MetaInfo) == [[0, 1, 2], [3, 4]]
+
+
+def test_resolution_counts():
+    # the counts of the reader win over the sizes
+    MetaInfo = create_metainfo([(4096, 4096), (2048, 2048), (1024, 1024), (512, 512)], counts=[2, 2])
+    assert bf.get_pyramid_series(MetaInfo) == [[0, 1], [2, 3]]
+
+
+def test_select_pylevel():
+    MetaInfo = create_metainfo([(4000, 3000), (2000, 1500), (1000, 750), (500, 375), (800, 600), (400, 300)])
+
+    # coarsest level with a pixel size of at most 2 micron
+    selection = bf.select_pylevel(MetaInfo, pixelsize=2.0)
+    assert [(s[1], s[2]) for s in selection] == [(2, 2), (5, 1)]
+
+    # finest level fitting inside the shape
+    selection = bf.select_pylevel(MetaInfo, maxshape=(700, 900))
+    assert [(s[1], s[3]) for s in selection] == [(3, (375, 500)), (4, (600, 800))]
+
+
+if __name__ == '__main__':
+
+    test_single_resolution_scenes()
+    test_pyramids_with_different_aspect_ratio()
+    test_pyramids_with_rounded_sizes()
+    test_resolution_counts()
+    test_select_pylevel()
+    print('Done.')
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_read_plane.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks that bftools.read_plane decodes single channel, interleaved RGB and planar RGB planes.
+The bytes are served by a reader object implementing the few methods of the BioFormats
+reader used by read_plane, so no JVM is needed. Can be run directly or with pytest.
+"""
+
+import numpy as np
+import bftools as bf
+
+
+class PlaneReader(object):
+    """
+    Serves the planes of an array [T, Z, C, Y, X] like a BioFormats reader with
+    samples per plane, which are interleaved or stored one after another.
+    """
+
+    def __init__(self, img5d, samples=1, interleaved=False):
+        self.img5d = img5d.astype('<u2')
+        self.samples = samples
+        self.interleaved = interleaved
+
+    def getSeries(self):
+        return 0
+
+    def setSeries(self, series):
+        pass
+
+    def getRGBChannelCount(self):
+        return self.samples
+
+    def isInterleaved(self):
+        return self.interleaved
+
+    def getIndex(self, z, c, t):
+        sizeT, sizeZ, sizeC = self.img5d.shape[:3]
+        return (t * sizeZ + z) * (sizeC // self.samples) + c
+
+    def getPixelType(self):
+        return 3
+
+    def isLittleEndian(self):
+        return True
+
+    def getSizeY(self):
+        return self.img5d.shape[3]
+
+    def getSizeX(self):
+        return self.img5d.shape[4]
+
+    def openBytes(self, index):
+        sizeT, sizeZ, sizeC = self.img5d.shape[:3]
+        effectiveC = sizeC // self.samples
+        t, rest = divmod(index, sizeZ * effectiveC)
+        z, c = divmod(rest, effectiveC)
+        plane = self.img5d[t, z, c * self.samples:(c + 1) * self.samples]
+        if self.interleaved:
+            plane = np.moveaxis(plane, 0, -1)
+        return np.ascontiguousarray(plane).tobytes()
+
+    def openBytesXYWH(self, index, x, y, width, height):
+        plane = np.frombuffer(self.openBytes(index), dtype='<u2')
+        if self.interleaved:
+            plane = plane.reshape(self.getSizeY(), self.getSizeX(), self.samples)[y:y + height, x:x + width]
+        else:
+            plane = plane.reshape(self.samples, self.getSizeY(), self.getSizeX())[:, y:y + height, x:x + width]
+        return np.ascontiguousarray(plane).tobytes()
+
+
+class Reader(object):
+
+    def __init__(self, jrdr):
+        self.rdr = jrdr
+
+
+def check_planes(samples, interleaved):
+    img5d = np.random.RandomState(1).randint(0, 4096, size=(2, 3, 6, 20, 30))
+    rdr = Reader(PlaneReader(img5d, samples=samples, interleaved=interleaved))
+
+    for t in range(2):
+        for z in range(3):
+            for c in range(6):
+                out = np.zeros((20, 30), dtype=np.uint16)
+                bf.read_plane(rdr, out, c=c, z=z, t=t)
+                assert np.array_equal(out, img5d[t, z, c])
+
+    out = np.zeros((8, 5), dtype=np.uint16)
+    bf.read_plane(rdr, out, c=4, z=1, t=1, xywh=(3, 7, 5, 8))
+    assert np.array_equal(out, img5d[1, 1, 4, 7:15, 3:8])
+
+
+def test_single_sample():
+    check_planes(1, False)
+
+
+def test_rgb_interleaved():
+    check_planes(3, True)
+
+
+def test_rgb_planar():
+    check_planes(3, False)
+
+
+if __name__ == '__main__':
+
+    test_single_sample()
+    test_rgb_interleaved()
+    test_rgb_planar()
+    print('Done.')
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_readerpool.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks that the ReaderPool hands out every reader exclusively. bftools.open_reader is
+replaced by a function creating dummy readers, so no JVM is needed.
+Can be run directly or with pytest.
+"""
+
+import os
+import tempfile
+import bftools as bf
+
+
+class DummyReader(object):
+
+    def __init__(self, imagefile):
+        self.imagefile = imagefile
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def create_files(number):
+    workdir = tempfile.mkdtemp(prefix='bftools_pool_')
+    files = []
+    for i in range(number):
+        files.append(os.path.join(workdir, 'image' + str(i) + '.tif'))
+        with open(files[-1], 'w') as f:
+            f.write(str(i))
+
+    return files
+
+
+def run_with_dummy_readers(check):
+    original = bf.open_reader
+    bf.open_reader = DummyReader
+    try:
+        check()
+    finally:
+        bf.open_reader = original
+
+
+def check_exclusive():
+    filename, = create_files(1)
+    pool = bf.ReaderPool(maxreaders=2)
+
+    # a second borrower of the same file gets its own reader
+    first = pool.get(filename)
+    second = pool.get(filename)
+    assert first is not second
+
+    # released readers are reused
+    assert pool.release(first)
+    assert pool.get(filename) is first
+    assert pool.release(first)
+    assert pool.release(second)
+    assert len(pool) == 2
+
+    # a reader can only be released once
+    third = pool.get(filename)
+    assert pool.release(third)
+    assert not pool.release(third)
+
+
+def check_close_and_evict():
+    files = create_files(3)
+    pool = bf.ReaderPool(maxreaders=2)
+
+    readers = [pool.get(filename) for filename in files]
+    for rdr in readers:
+        pool.release(rdr)
+
+    # only two idle readers are kept, the least recently used one is closed
+    assert readers[0].closed and not readers[1].closed and not readers[2].closed
+    assert files[0] not in pool
+
+    # a reader checked out while its file is closed is not given back to the pool
+    busy = pool.get(files[1])
+    pool.close(files[1])
+    assert not pool.release(busy)
+    assert files[1] not in pool
+
+
+def check_release_reader():
+    filename, = create_files(1)
+    pool = bf.ReaderPool(maxreaders=2)
+    bf.set_thread_readerpool(pool)
+    try:
+        rdr = bf.get_reader(filename)
+        assert bf.get_reader(filename) is not rdr
+        bf.release_reader(rdr)
+        assert bf.get_reader(filename) is rdr
+    finally:
+        bf.set_thread_readerpool(None)
+
+
+def test_exclusive():
+    run_with_dummy_readers(check_exclusive)
+
+
+def test_close_and_evict():
+    run_with_dummy_readers(check_close_and_evict)
+
+
+def test_release_reader():
+    run_with_dummy_readers(check_release_reader)
+
+
+if __name__ == '__main__':
+
+    test_exclusive()
+    test_close_and_evict()
+    test_release_reader()
+    print('Done.')
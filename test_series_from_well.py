@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_series_from_well.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks that get_series_from_well reads the series listed in seriesseq, which do not need
+to be contiguous. The planes are served by dummy readers, so no JVM is needed.
+Can be run directly or with pytest.
+"""
+
+import numpy as np
+import bftools as bf
+
+# 14 series [T, Z, C, Y, X] - the value of every pixel encodes series, t, z and c
+NUMSERIES = 14
+SIZES = [NUMSERIES, 2, 3, 2, 8, 10]
+
+
+def get_data():
+    S, T, Z, C, Y, X = SIZES
+    s, t, z, c = np.indices((S, T, Z, C))
+    values = (1000 * s + 100 * t + 10 * z + c).astype(np.uint16)
+
+    return np.broadcast_to(values[..., np.newaxis, np.newaxis], SIZES).copy()
+
+
+class SeriesReader(object):
+    """
+    The methods of the BioFormats reader used by read_plane for a file with several series.
+    """
+
+    def __init__(self, img6d):
+        self.img6d = img6d.astype('<u2')
+        self.series = 0
+
+    def getSeries(self):
+        return self.series
+
+    def setSeries(self, series):
+        self.series = series
+
+    def getRGBChannelCount(self):
+        return 1
+
+    def getIndex(self, z, c, t):
+        return (t * SIZES[2] + z) * SIZES[3] + c
+
+    def getPixelType(self):
+        return 3
+
+    def isLittleEndian(self):
+        return True
+
+    def getSizeY(self):
+        return SIZES[4]
+
+    def getSizeX(self):
+        return SIZES[5]
+
+    def openBytes(self, index):
+        t, rest = divmod(index, SIZES[2] * SIZES[3])
+        z, c = divmod(rest, SIZES[3])
+        return self.img6d[self.series, t, z, c].tobytes()
+
+
+class Reader(object):
+
+    def __init__(self, img6d):
+        self.rdr = SeriesReader(img6d)
+
+    def close(self):
+        pass
+
+
+class NoJVM(object):
+    # replaces the JVM session and javabridge, the reading threads have nothing to attach to
+
+    def start(self):
+        pass
+
+    def attach(self):
+        pass
+
+    def detach(self):
+        pass
+
+
+def run_with_dummy_readers(check):
+    img6d = get_data()
+    original = bf.open_reader, bf.JVM, bf.jv
+    bf.open_reader = lambda imagefile: Reader(img6d)
+    bf.JVM = NoJVM()
+    bf.jv = NoJVM()
+    try:
+        check(img6d)
+    finally:
+        bf.open_reader, bf.JVM, bf.jv = original
+        bf.close_readers()
+
+
+def test_well_units():
+    units = bf.get_well_units(SIZES, [3, 7, 12])
+
+    assert len(units) == 3 * 2 * 3 * 2
+    assert units[0] == (0, (0, 0, 0, 0), 3, 0, 0, 0)
+    assert units[-1] == (0, (2, 1, 2, 1), 12, 1, 2, 1)
+    assert sorted(set(unit[2] for unit in units)) == [3, 7, 12]
+
+
+def check_sequential(img6d):
+    seriesseq = [3, 7, 12]
+    img6dwell = bf.get_series_from_well('well.czi', list(SIZES), seriesseq, usepool=True)
+
+    assert img6dwell.shape == tuple([3] + SIZES[1:])
+    assert np.array_equal(img6dwell, img6d[seriesseq])
+
+
+def test_sequential():
+    run_with_dummy_readers(check_sequential)
+
+
+def check_threaded(img6d):
+    seriesseq = [13, 2, 5, 9]
+    img6dwell = bf.get_series_from_well('well.czi', list(SIZES), seriesseq, num_threads=3)
+
+    assert np.array_equal(img6dwell, img6d[seriesseq])
+
+
+def test_threaded():
+    run_with_dummy_readers(check_threaded)
+
+
+if __name__ == '__main__':
+
+    test_well_units()
+    test_sequential()
+    test_threaded()
+    print('Done.')
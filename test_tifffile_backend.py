@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_tifffile_backend.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks that only OME-TIFF files are read by tifffile and that plain TIFF files are
+passed on to BioFormats by read_native. Can be run directly or with pytest.
+"""
+
+import os
+import tempfile
+import numpy as np
+import tifffile
+import bftools as bf
+
+
+def test_tifffile_backend():
+
+    data = np.arange(2 * 3 * 32 * 48, dtype=np.uint16).reshape(2, 3, 32, 48)
+    tmpdir = tempfile.mkdtemp()
+    plainfile = os.path.join(tmpdir, 'plain.tif')
+    omefile = os.path.join(tmpdir, 'stack.ome.tif')
+    tifffile.imwrite(plainfile, data, photometric='minisblack')
+    tifffile.imwrite(omefile, data, photometric='minisblack', metadata={'axes': 'ZCYX'})
+
+    # the plain TIFF raises inside the tifffile reader and falls back to BioFormats
+    assert bf.read_native(plainfile, 'auto') is None
+    assert bf.read_native(plainfile, 'tifffile') is None
+
+    img6d = bf.read_native(omefile, 'auto')
+    assert img6d.shape == (1, 1, 2, 3, 32, 48)
+    assert np.array_equal(img6d[0, 0], data)
+
+    # series IDs beyond the file are an error of tifffile, BioFormats is used instead
+    assert bf.read_native(omefile, 'auto', series=[5]) is None
+
+
+if __name__ == '__main__':
+
+    test_tifffile_backend()
+    print('Done.')
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_zarr_export.py
+Date: 18.10.2026
+Version. 0.1
+"""
+
+from __future__ import print_function
+import bftools as bf
+import zarrtools as zt
+import numpy as np
+import time
+
+filename = r'testdata/B4_B5_S=8_4Pos_perWell_T=2_Z=1_CH=1.czi'
+zarrpath = filename[:-4] + '.zarr'
+
+# specify bioformats_package.jar to use if required
+bfpackage = r'bfpackage/5.9.2/bioformats_package.jar'
+bf.set_bfpath(bfpackage)
+
+start = time.time()
+
+# 256x256 chunks, pyramid levels until a plane fits into one chunk and 8 writer threads
+root = zt.convert_to_zarr(filename, zarrpath,
+                          chunks=(1, 256, 256),
+                          levels='auto',
+                          num_workers=8,
+                          overwrite=True)
+
+print('Time [s]        : ', np.round(time.time() - start, 3))
+print('Series written  : ', [name for name in root.group_keys()])
+
+MetaInfo, planetable = zt.read_zarr_attributes(zarrpath)
+print('Sizes [STZCYX]  : ', MetaInfo['Sizes'])
+print(planetable.head())
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: test_zarr_planetable.py
+Date: 18.10.2026
+Version. 0.1
+
+Checks the planetable stored by zarrtools.convert_to_zarr with planetable=True using a
+synthetic OME-TIFF with stage positions. The complete export needs the JVM and is skipped
+without javabridge and Java. Can be run directly or with pytest.
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import bftools as bf
+import zarrtools as zt
+
+SIZES = [2, 2, 3, 2, 64, 48]
+
+
+def create_testdata(filename):
+    """
+    Write an OME-TIFF [S, T, Z, C, Y, X] with a planetable and return the planetable.
+    """
+
+    img6d = np.random.RandomState(3).randint(0, 4096, size=SIZES).astype(np.uint16)
+    S, T, Z, C = SIZES[:4]
+
+    s, t, z, c = [index.ravel() for index in np.indices((S, T, Z, C))]
+    planetable = pd.DataFrame({'ImageID': s, 'TheT': t, 'TheZ': z, 'TheC': c,
+                               'XPos': 1000.0 * s + 0.5,
+                               'YPos': 2000.0 * s + 1.5,
+                               'ZPos': 0.5 * z,
+                               'DeltaT': 10.0 * t})
+
+    bf.write_ometiff(filename, img6d, planetable=planetable)
+
+    return planetable
+
+
+def check_planetable(stored, planetable):
+    stored = pd.DataFrame(stored).sort_values(['ImageID', 'TheT', 'TheZ', 'TheC']).reset_index(drop=True)
+    for column in ['ImageID', 'TheT', 'TheZ', 'TheC', 'XPos', 'YPos', 'ZPos', 'DeltaT']:
+        assert np.allclose(stored[column].values.astype(float), planetable[column].values.astype(float)), column
+
+
+def test_planetable_attribute():
+    import tifffile
+
+    filename = os.path.join(tempfile.mkdtemp(prefix='bftools_zarr_'), 'planetable.ome.tiff')
+    planetable = create_testdata(filename)
+
+    with tifffile.TiffFile(filename) as tif:
+        omexml = tif.ome_metadata.encode('utf-8')
+
+    check_planetable(zt.get_planetable_attribute(omexml), planetable)
+
+
+def test_convert_to_zarr_planetable():
+    try:
+        bf.JVM.start()
+    except Exception:
+        try:
+            import pytest
+            pytest.skip('The JVM cannot be started.')
+        except ImportError:
+            print('The JVM cannot be started - skipping the export.')
+            return
+
+    workdir = tempfile.mkdtemp(prefix='bftools_zarr_')
+    filename = os.path.join(workdir, 'planetable.ome.tiff')
+    planetable = create_testdata(filename)
+
+    zt.convert_to_zarr(filename, os.path.join(workdir, 'planetable.zarr'), planetable=True)
+    MetaInfo, stored = zt.read_zarr_attributes(os.path.join(workdir, 'planetable.zarr'))
+
+    check_planetable(stored, planetable)
+
+
+if __name__ == '__main__':
+
+    test_planetable_attribute()
+    test_convert_to_zarr_planetable()
+    print('Done.')
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Sebi
+
+File: zarrtools.py
+Date: 18.10.2026
+Version. 0.1
+
+Export of any file readable by BioFormats into a chunked and compressed Zarr store
+using the OME-NGFF multiscale layout (version 0.4). Every series is stored as its
+own image group like done by bioformats2raw.
+
+Usage:
+------
+
+import zarrtools as zt
+
+zt.convert_to_zarr(filename, filename[:-4] + '.zarr', chunks=(1, 1024, 1024), levels='auto', num_workers=8)
+"""
+
+import bftools as bf
+import numpy as np
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+NGFF_VERSION = '0.4'
+
+# default chunk shape (Z, Y, X) - T and C are always chunked plane by plane
+CHUNKS = (1, 1024, 1024)
+
+
+def get_compressor(cname='zstd', clevel=5, shuffle=True):
+    """
+    Return the default Blosc compressor used for all arrays.
+    """
+    import numcodecs
+
+    if shuffle:
+        shuffle = numcodecs.Blosc.BITSHUFFLE
+    else:
+        shuffle = numcodecs.Blosc.NOSHUFFLE
+
+    return numcodecs.Blosc(cname=cname, clevel=clevel, shuffle=shuffle)
+
+
+def get_series_info(imagefile, series=None, usepool=True):
+    """
+    Return the sizes [T, Z, C, Y, X] and the dtype of every selected series as dictionary.
+    """
+
+    bf.JVM.start()
+
+    rdr = bf.get_reader(imagefile, usepool=usepool)
+    jrdr = rdr.rdr
+
+    if series is None:
+        series = range(jrdr.getSeriesCount())
+    elif isinstance(series, (int, np.integer)):
+        series = [series]
+
+    info = {}
+    for s in series:
+        jrdr.setSeries(s)
+        info[s] = ([jrdr.getSizeT(), jrdr.getSizeZ(), jrdr.getSizeC(), jrdr.getSizeY(), jrdr.getSizeX()],
+                   np.dtype(bf.BF2NP_DTYPE[jrdr.getPixelType()]))
+
+    bf.release_reader(rdr, usepool=usepool)
+
+    return info
+
+
+def get_num_levels(sizes, chunks, downscale=2):
+    # number of downsampled levels until a plane fits into a single chunk
+
+    sizey, sizex = sizes[3], sizes[4]
+    levels = 0
+    while sizey > chunks[1] or sizex > chunks[2]:
+        sizey = sizey // downscale
+        sizex = sizex // downscale
+        levels += 1
+
+    return levels
+
+
+def to_json(value):
+    """
+    Convert MetaInfo and planetable values into types, which can be stored as JSON attributes.
+    """
+
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_json(value.tolist())
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        # NaN and Inf are not valid JSON
+        return value if np.isfinite(value) else None
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+
+    return str(value)
+
+
+def get_planetable_attribute(omexml):
+    """
+    Return the planetable of the OME-XML as dictionary of columns, which can be stored as JSON attribute.
+    """
+
+    table = bf.planetable_from_omexml(omexml)
+
+    return to_json(table.to_dict(orient='list'))
+
+
+def create_group(zarrpath, overwrite=False):
+    """
+    Create the Zarr group for the export using the Zarr format 2 required by OME-NGFF 0.4.
+    """
+    import zarr
+
+    mode = 'w' if overwrite else 'w-'
+    try:
+        return zarr.open_group(zarrpath, mode=mode, zarr_format=2)
+    except TypeError:
+        # zarr 2.x only knows format 2
+        return zarr.open_group(zarrpath, mode=mode)
+
+
+def create_array(group, name, shape, chunks, dtype, compressor):
+    """
+    Create an empty array inside group for zarr 2.x and zarr 3.x.
+    """
+    import zarr
+
+    if int(zarr.__version__.split('.')[0]) >= 3:
+        return group.create_array(name, shape=shape, chunks=chunks, dtype=dtype,
+                                  compressors=compressor, fill_value=0)
+
+    return group.create_dataset(name, shape=shape, chunks=chunks, dtype=dtype,
+                                compressor=compressor, fill_value=0)
+
+
+def get_multiscales(name, numlevels, scalex=1.0, scaley=1.0, scalez=1.0, downscale=2):
+    """
+    Return the OME-NGFF multiscales metadata for an image with the axes T, C, Z, Y, X.
+    """
+
+    datasets = []
+    for level in range(numlevels + 1):
+        factor = float(downscale ** level)
+        datasets.append({'path': str(level),
+                         'coordinateTransformations': [{'type': 'scale',
+                                                        'scale': [1.0, 1.0, float(scalez),
+                                                                  float(scaley) * factor,
+                                                                  float(scalex) * factor]}]})
+
+    return [{'version': NGFF_VERSION,
+             'name': name,
+             'axes': [{'name': 't', 'type': 'time'},
+                      {'name': 'c', 'type': 'channel'},
+                      {'name': 'z', 'type': 'space', 'unit': 'micrometer'},
+                      {'name': 'y', 'type': 'space', 'unit': 'micrometer'},
+                      {'name': 'x', 'type': 'space', 'unit': 'micrometer'}],
+             'datasets': datasets,
+             'type': 'mean'}]
+
+
+def write_slab(arrays, t, c, z, slab, downscale=2):
+    """
+    Write the planes slab [Z, Y, X] starting at z into all levels of an image.
+    Runs inside the writer pool. The slab covers complete chunks, so no other
+    task writes into the same chunks.
+    """
+
+    arrays[0][t, c, z:z + slab.shape[0]] = slab
+
+    for level in range(1, len(arrays)):
+        slab = np.stack([bf.downsample_plane(plane, downscale) for plane in slab])
+        shape = arrays[level].shape
+        arrays[level][t, c, z:z + slab.shape[0]] = slab[:, :shape[3], :shape[4]]
+
+    return slab.shape[0]
+
+
+def convert_to_zarr(imagefile, zarrpath,
+                    series=None,
+                    chunks=CHUNKS,
+                    compressor=None,
+                    levels=0,
+                    downscale=2,
+                    num_workers=4,
+                    prefetch=8,
+                    MetaInfo=None,
+                    planetable=True,
+                    overwrite=False):
+    """
+    Stream all planes of imagefile into a Zarr store with the OME-NGFF multiscale layout.
+
+    zarrpath    - path of the Zarr store. Every series is stored in the group <series>
+                  with the arrays 0, 1, ... for the resolution levels and the axes T, C, Z, Y, X.
+    series      - series to export - default is all series
+    chunks      - chunk shape (Z, Y, X). Every chunk holds planes of a single T and C.
+    compressor  - numcodecs compressor - default is Blosc with zstd, see get_compressor
+    levels      - number of downsampled levels or 'auto' to add levels until a plane fits into one chunk
+    downscale   - factor between two levels in X and Y
+    num_workers - number of threads compressing and writing the chunks
+    prefetch    - number of planes read ahead by iterate_planes
+    MetaInfo    - MetaInfo dictionary - default is get_relevant_metainfo_wrapper(imagefile)
+    planetable  - store the planetable as attribute as well
+
+    Only the planes of the chunks currently filled are kept in memory. Completed chunks
+    are compressed and written by the writer pool while the next planes are read.
+    MetaInfo and the planetable are stored as attributes 'bftools' of the root group.
+
+    Returns the root Zarr group.
+    """
+
+    if compressor is None:
+        compressor = get_compressor()
+
+    if MetaInfo is None:
+        MetaInfo = bf.get_relevant_metainfo_wrapper(imagefile)
+
+    info = get_series_info(imagefile, series=series)
+
+    root = create_group(zarrpath, overwrite=overwrite)
+
+    # layout of bioformats2raw with one image group per series
+    root.attrs['bioformats2raw.layout'] = 3
+
+    attributes = {'MetaInfo': to_json(MetaInfo), 'source': imagefile}
+    if planetable:
+        # the planes are taken from the OME-XML of the reader opened by get_series_info already
+        rdr = bf.get_reader(imagefile)
+        omexml = bf.get_OMEXML_from_reader(rdr)
+        bf.release_reader(rdr)
+        attributes['planetable'] = get_planetable_attribute(omexml)
+    root.attrs['bftools'] = attributes
+
+    scalex = MetaInfo['XScale'] or 1.0
+    scaley = MetaInfo['YScale'] or 1.0
+    scalez = MetaInfo['ZScale'] or 1.0
+
+    arrays = {}
+    for s, (sizes, dtype) in info.items():
+        T, Z, C, Y, X = sizes
+        numlevels = get_num_levels(sizes, chunks, downscale) if levels == 'auto' else int(levels)
+
+        image = root.create_group(str(s))
+        image.attrs['multiscales'] = get_multiscales(str(s), numlevels, scalex=scalex, scaley=scaley,
+                                                     scalez=scalez, downscale=downscale)
+
+        arrays[s] = []
+        for level in range(numlevels + 1):
+            sizey = Y // downscale ** level
+            sizex = X // downscale ** level
+            arrays[s].append(create_array(image, str(level), shape=(T, C, Z, sizey, sizex),
+                                          chunks=(1, 1, min(chunks[0], Z), min(chunks[1], sizey), min(chunks[2], sizex)),
+                                          dtype=dtype, compressor=compressor))
+
+    # planes waiting for the missing planes of their chunks - key is (series, t, c, first z of the chunk)
+    slabs = {}
+    pending = []
+    # limits the number of slabs waiting for the writer pool, so memory stays bounded
+    slots = threading.BoundedSemaphore(max(1, 2 * num_workers))
+
+    def release(future):
+        slots.release()
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for s, t, z, c, plane in bf.iterate_planes(imagefile, series=list(info.keys()), prefetch=prefetch):
+            Z = info[s][0][1]
+            chunkz = min(chunks[0], Z)
+            z0 = (z // chunkz) * chunkz
+            depth = min(chunkz, Z - z0)
+
+            key = (s, t, c, z0)
+            if key not in slabs:
+                slabs[key] = [np.empty((depth,) + plane.shape, dtype=plane.dtype), 0]
+            slab = slabs[key]
+            slab[0][z - z0] = plane
+            slab[1] += 1
+
+            # the chunks of this slab are complete and can be written
+            if slab[1] == depth:
+                del slabs[key]
+                slots.acquire()
+                future = executor.submit(write_slab, arrays[s], t, c, z0, slab[0], downscale)
+                future.add_done_callback(release)
+                pending.append(future)
+
+        # raise the first error of the writer pool
+        for future in pending:
+            future.result()
+
+    if slabs:
+        print('Incomplete chunks were not written:', sorted(slabs.keys()))
+
+    return root
+
+
+def read_zarr_attributes(zarrpath):
+    """
+    Return the MetaInfo and the planetable stored by convert_to_zarr.
+    """
+    import zarr
+    import pandas as pd
+
+    root = zarr.open_group(zarrpath, mode='r')
+    attributes = dict(root.attrs)['bftools']
+
+    planetable = attributes.get('planetable')
+    if planetable is not None:
+        planetable = pd.DataFrame(planetable)
+
+    return attributes['MetaInfo'], planetable
+
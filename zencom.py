@@ -27,7 +27,7 @@ def getZENScripting():
 
 def readXYZ(Zen):
 
-    xyz = [np.NaN, np.NaN, np.NaN]
+    xyz = [np.nan, np.nan, np.nan]
 
     # read actual XYZ positions
     try: